@@ -31,6 +31,26 @@ class CrawlerConfig:
         )
     )
 
+    # Usa o template JSON pré-serializado do payload; "false" volta ao deepcopy por requisição
+    payload_template_enabled: bool = field(
+        default_factory=lambda: os.getenv("PAYLOAD_TEMPLATE_ENABLED", "True").lower()
+        == "true"
+    )
+
+    # Busca a próxima página (via RestartTokens) enquanto a atual é normalizada
+    page_prefetch_enabled: bool = field(
+        default_factory=lambda: os.getenv("PAGE_PREFETCH_ENABLED", "True").lower()
+        == "true"
+    )
+
+    # Pool de conexões e retries do HTTPAdapter montado na sessão do crawler
+    http_pool_maxsize: int = field(
+        default_factory=lambda: int(os.getenv("HTTP_POOL_MAXSIZE", "64"))
+    )
+    http_max_retries: int = field(
+        default_factory=lambda: int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    )
+
     # Configurações de Cache
     cache_default_timeout: int = field(
         default_factory=lambda: int(os.getenv("CACHE_DEFAULT_TIMEOUT", "300"))
@@ -3,25 +3,33 @@ import csv
 import json
 from datetime import datetime, timedelta
 import os
-from typing import Dict, List, Optional, Union, Any, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Union, Any, Tuple
 import locale
-import uuid
-from concurrent.futures import ThreadPoolExecutor
+import logging
+import sys
+import threading
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from tenacity import retry, stop_after_attempt, wait_exponential
 import re
-from copy import deepcopy
 from io import StringIO
 from decimal import Decimal, InvalidOperation
 import urllib.parse
+from types import MappingProxyType
 
+import orjson
 import requests
-from pydantic import ValidationError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pydantic import ValidationError, validate_model
 
 from config import (
     config,
     field_config,
     PAYLOAD_STRUCTURE,
 )
+from crawler.request_ids import fast_request_id
 from logger import get_logger
 from models.models import Precatorio
 from metrics import REQUESTS_TOTAL, RECORDS_PROCESSED, track_time
@@ -29,6 +37,18 @@ from schemas.entity_mapping import get_api_entity_name
 
 logger = get_logger(__name__)
 
+
+# Destino de uma coluna na página: (campo CSV, tipo, DN, lista do ValueDict do DN)
+_ColumnTarget = Tuple[str, str, Optional[str], Optional[List[Any]]]
+
+
+def _debug_enabled() -> bool:
+    """Indica se logs de debug serão emitidos (nível definido em configure_logging).
+
+    Usado para não montar f-strings e dicts de debug em laços quentes quando o nível é INFO.
+    """
+    return logging.getLogger().isEnabledFor(logging.DEBUG)
+
 # Tenta configurar o locale
 try:
     locale.setlocale(locale.LC_ALL, "pt_BR.UTF-8")
@@ -56,13 +76,45 @@ except locale.Error:
 # Ajustado para corresponder ao OrderBy do cURL funcional
 PAGINATION_ORDER_BY_COLUMNS = ["dfslcp_num_ordem"]
 
+# Sentinelas do template pré-serializado do payload (ver _build_payload_templates).
+# As de valor completo são substituídas junto com as aspas do JSON.
+_ENTITY_SENTINEL = "__ENTITY__"
+_YEAR_SENTINEL = "__YEAR__"
+_COUNT_SENTINEL = "__COUNT__"
+_RESTART_TOKENS_SENTINEL = "__RESTART_TOKENS__"
+
+# Padrões compilados uma vez: "datetime(2024,5,13...)" e "Agg(Tabela.coluna)"
+_DATETIME_RE = re.compile(r"datetime\s*\(([^)]+)\)", re.IGNORECASE)
+_AGG_RE = re.compile(r"^[A-Za-z_0-9]+\(([^)]+)\)$")
+
+# Valor de campo vazio/nulo (ou com erro de formatação) por tipo; os demais viram "-".
+# Datas vazias: o Pydantic converte "" para None em Optional[datetime]
+_EMPTY_VALUE_DEFAULTS: Dict[str, str] = {
+    "date": "",
+    "int": "0",
+    "float": "0",
+    "Decimal": "0",
+}
+
+# Default de "C" ausente nas linhas do DM0, sem alocar uma lista vazia por linha
+_EMPTY_VALUES: Tuple[Any, ...] = ()
 
-def format_currency(value: float) -> str:
-    """Formata valor monetário manualmente se o locale não estiver disponível."""
+# Dia zero das datas seriais do Excel/Power BI
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+_MIDNIGHT = datetime.min.time()
+
+
+
+def format_currency(value: Union[float, Decimal]) -> str:
+    """Formata valor monetário manualmente se o locale não estiver disponível.
+
+    Aceita Decimal direto: a formatação manual não passa por float.
+    """
     if LOCALE_OK:
         return locale.currency(value, grouping=True, symbol=True)
 
-    # Formatação manual
+    # Formatação manual: Decimal não aceita agrupamento com "_", então agrupa com ","
+    # e troca os separadores via placeholder (replace encadeado é mais rápido que translate)
     value_str = f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
     return f"R$ {value_str}"
 
@@ -75,16 +127,149 @@ class PrecatoriosCrawler:
         self.resource_key = self.config_instance.resource_key
         self.headers = self.config_instance.headers
         self.current_entity_processed_records = 0
+        # Contador compartilhado entre as threads de fetch_many_precatorios_data
+        self._processed_records_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self._mount_http_adapter()
         self.base_payload = PAYLOAD_STRUCTURE
+        # Cópia serializada do payload base: orjson.loads clona bem mais rápido que deepcopy
+        self._base_payload_json = orjson.dumps(self.base_payload)
         self.pagination_order_by_columns = PAGINATION_ORDER_BY_COLUMNS
         self.csv_fields = field_config.csv_fields
+        # Extração e posições das colunas formatadas no CSV, resolvidas uma vez
+        # Com um único campo o itemgetter devolveria o valor em vez de uma tupla
+        self._csv_row_getter: Callable[[Dict[str, Any]], Tuple[Any, ...]] = (
+            itemgetter(*self.csv_fields)
+            if len(self.csv_fields) > 1
+            else lambda row, fields=tuple(self.csv_fields): tuple(
+                row[field_name] for field_name in fields
+            )
+        )
+        self._csv_date_index: Optional[int] = (
+            self.csv_fields.index("data_cadastro")
+            if "data_cadastro" in self.csv_fields
+            else None
+        )
+        self._csv_currency_indexes: List[Tuple[str, int]] = [
+            (field_name, self.csv_fields.index(field_name))
+            for field_name in ("valor_original", "valor_atual")
+            if field_name in self.csv_fields
+        ]
+        # Valor monetário ausente sai sempre igual: formatado uma vez
+        self._csv_zero_currency = format_currency(0.0)
+        self._payload_templates = self._build_payload_templates()
+        # Formatador por tipo de campo: um lookup em vez da cadeia de comparações
+        self._typed_formatters: Dict[str, Callable[[Any, str, str], str]] = {
+            "processo": self._format_processo,
+            "int": self._format_number,
+            "float": self._format_number,
+            "Decimal": self._format_number,
+            "date": self._format_date,
+        }
+        # Mapeamento nome da API -> config do campo CSV, montado uma vez por crawler
+        self._api_name_to_csv_field_map: Dict[str, Dict[str, Any]] = {
+            attrs["api_name"]: {
+                "csv_field": csv_fld,
+                "type": attrs.get("type", "str"),
+                "default": attrs.get("default"),
+            }
+            for csv_fld, attrs in self.field_config_instance.field_mapping.items()
+            if attrs.get("api_name")
+        }
+        # Defaults já formatados (str imutáveis), somente leitura: cada linha parte de uma cópia rasa
+        self._default_row: Mapping[str, Any] = MappingProxyType(
+            {
+                csv_f: self._format_value(attrs.get("default"), attrs.get("type", "str"))
+                for csv_f, attrs in self.field_config_instance.field_mapping.items()
+            }
+        )
+
+    def _mount_http_adapter(self) -> None:
+        """Monta um HTTPAdapter com pool maior e retries de 5xx transitórios na sessão."""
+        retries = Retry(
+            total=self.config_instance.http_max_retries,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            # A consulta querydata do Power BI é um POST somente leitura
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+            # Esgotados os retries, devolve a resposta para o raise_for_status/tenacity
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max(1, self.config_instance.http_pool_maxsize // 2),
+            pool_maxsize=self.config_instance.http_pool_maxsize,
+            max_retries=retries,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _build_payload_templates(self) -> Dict[Tuple[bool, bool], str]:
+        """Serializa uma vez o payload com sentinelas, indexado por (tem_ano, tem_restart_tokens)."""
+        templates: Dict[Tuple[bool, bool], str] = {}
+        for has_year in (False, True):
+            for has_restart_tokens in (False, True):
+                payload = self._build_payload(
+                    api_entity_name=_ENTITY_SENTINEL,
+                    effective_count=_COUNT_SENTINEL,
+                    year=_YEAR_SENTINEL if has_year else None,
+                    restart_tokens=(
+                        _RESTART_TOKENS_SENTINEL if has_restart_tokens else None
+                    ),
+                )
+                templates[(has_year, has_restart_tokens)] = json.dumps(
+                    payload, separators=(",", ":")
+                )
+        return templates
 
-    def _decode_utf8(self, value: str) -> str:
-        """Decodifica uma string com caracteres especiais em UTF-8."""
+    def _render_payload_body(
+        self,
+        entity_slug_or_official_name: str,
+        count: Optional[int] = None,
+        year: Optional[int] = None,
+        restart_tokens: Optional[List[Any]] = None,
+    ) -> str:
+        """Gera o corpo JSON da requisição substituindo as sentinelas do template."""
+        api_entity_name = get_api_entity_name(entity_slug_or_official_name)
+        if not api_entity_name:
+            logger.error(
+                f"Nome oficial da API não encontrado para: {entity_slug_or_official_name}"
+            )
+            raise ValueError(
+                f"Slug ou nome da entidade inválido: {entity_slug_or_official_name}"
+            )
+        effective_count = (
+            count
+            if count is not None and count > 0
+            else self.config_instance.batch_size
+        )
+
+        body = self._payload_templates[(year is not None, bool(restart_tokens))]
+        body = body.replace(f'"{_COUNT_SENTINEL}"', str(int(effective_count)))
+        if year is not None:
+            # json.dumps(...)[1:-1] escapa o valor para dentro da string JSON
+            body = body.replace(_YEAR_SENTINEL, json.dumps(str(year))[1:-1])
+        body = body.replace(_ENTITY_SENTINEL, json.dumps(api_entity_name)[1:-1])
+        if restart_tokens:
+            body = body.replace(
+                f'"{_RESTART_TOKENS_SENTINEL}"',
+                json.dumps(restart_tokens, separators=(",", ":")),
+            )
+        return body
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _decode_utf8(value: str) -> str:
+        """Decodifica uma string com caracteres especiais em UTF-8.
+
+        Função pura chamada por célula; os textos se repetem muito (comarcas, naturezas),
+        então o resultado fica em cache.
+        """
         if not isinstance(value, str):
             return str(value)
+        # ASCII sem barra invertida não tem escapes nem mojibake: a cadeia abaixo é identidade
+        if value.isascii() and "\\" not in value:
+            return value
         try:
             # Decodifica sequências de escape unicode (\u00XX)
             return (
@@ -98,156 +283,234 @@ class PrecatoriosCrawler:
 
     def _format_value(self, value: str, field_type: str) -> str:
         """Formata o valor de acordo com o tipo do campo."""
-        value_str = str(value)
-
-        if value is None or (
-            isinstance(value_str, str)
-            and (not value_str.strip() or value_str.lower() == "none")
-        ):
-            if field_type == "date":
-                return ""  # Pydantic converterá para None em Optional[datetime]
-            if field_type in ["int", "float", "Decimal"]:
-                return "0"  # Default para números
-            return "-"  # Default para outras strings vazias
+        # Nulo sai direto, sem montar a string "None"
+        if value is None:
+            return _EMPTY_VALUE_DEFAULTS.get(field_type, "-")
+
+        value_str = value if isinstance(value, str) else str(value)
+        if not value_str.strip() or value_str.lower() == "none":
+            return _EMPTY_VALUE_DEFAULTS.get(field_type, "-")
 
         try:
-            if field_type == "processo":
-                if isinstance(value, (int, float)):  # value here is original
-                    return f"{value:020.0f}"
+            formatter = self._typed_formatters.get(field_type)
+            if formatter is None:
                 return value_str.strip()
+            return formatter(value, value_str, field_type)
 
-            if field_type in ["int", "float", "Decimal"]:
-                temp_value = value_str
-                if isinstance(temp_value, str):
-                    temp_value = temp_value.replace("R$", "").strip()
-                    if "," in temp_value and "." in temp_value:
-                        if temp_value.rfind(".") < temp_value.rfind(","):
-                            temp_value = temp_value.replace(".", "").replace(",", ".")
-                    elif "," in temp_value:
-                        temp_value = temp_value.replace(",", ".")
+        except Exception as e:
+            logger.warning(
+                "format_error",
+                value=value_str,
+                original_value_type=str(type(value)),
+                field_type=field_type,
+                error=str(e),
+                exc_info=True,
+            )
+            return _EMPTY_VALUE_DEFAULTS.get(field_type, "-")
+
+    def _format_processo(self, value: Any, value_str: str, field_type: str) -> str:
+        """Formata o número do processo (numérico vira string com 20 dígitos)."""
+        if isinstance(value, (int, float)):  # value here is original
+            return f"{value:020.0f}"
+        return value_str.strip()
+
+    def _format_number(self, value: Any, value_str: str, field_type: str) -> str:
+        """Normaliza números em formato brasileiro ou não para int/float/Decimal."""
+        # int/float do JSON não passam pela limpeza de string (bool fica de fora)
+        if type(value) is int or type(value) is float:
+            if field_type == "int":
+                return str(int(value))
+            return str(float(value))
+
+        temp_value = value_str
+        if isinstance(temp_value, str):
+            temp_value = temp_value.replace("R$", "").strip()
+            # Vírgula decimal (1.234,56 ou 1234,56): remove milhar e troca por ponto.
+            # Se não houver ponto, rfind(".") == -1 e a remoção de pontos é no-op.
+            comma_pos = temp_value.rfind(",")
+            if comma_pos != -1 and temp_value.rfind(".") < comma_pos:
+                temp_value = temp_value.replace(".", "").replace(",", ".")
+            elif "," in temp_value:
+                # Vírgula antes do ponto (1,234.56): é separador de milhar
+                temp_value = temp_value.replace(",", "")
 
-                try:
-                    val_float = float(temp_value)
-                    if field_type == "int":
-                        return str(int(val_float))
-                    return str(val_float)
-                except (ValueError, TypeError):
-                    logger.warning(
-                        f"Could not convert numeric value '{value_str}' "
-                        f"(processed to '{temp_value}') to {field_type}. Defaulting to '0'."
-                    )
-                    return "0"
-
-            if field_type == "date":
-                if isinstance(value_str, str):
-                    # 1. Tentar formato "datetime(YYYY,MM,DD...)"
-                    if "datetime" in value_str.lower():
-                        match = re.search(
-                            r"datetime\\s*\\(([^)]+)\\)", value_str, re.IGNORECASE
-                        )
-                        if match:
-                            try:
-                                components_str = match.group(1).split(",")
-                                components = [int(c.strip()) for c in components_str]
-                                if len(components) >= 3:
-                                    # Ajustar mês se parecer 0-indexado (improvável com PowerBI, mas seguro)
-                                    if components[1] == 0 and len(components) > 1:
-                                        components[1] = 1
-                                    return str(datetime(*components))
-                                else:
-                                    logger.warning(
-                                        f"Date string '{value_str}' (datetime format) has insufficient components."
-                                    )
-                                    return ""
-                            except ValueError as e:
-                                logger.warning(
-                                    f"Error parsing datetime components from '{value_str}': {e}"
-                                )
-                                return ""
+        try:
+            val_float = float(temp_value)
+            if field_type == "int":
+                return str(int(val_float))
+            return str(val_float)
+        except (ValueError, TypeError):
+            logger.warning(
+                f"Could not convert numeric value '{value_str}' "
+                f"(processed to '{temp_value}') to {field_type}. Defaulting to '0'."
+            )
+            return "0"
 
-                    # 2. Tentar converter para float e verificar se é timestamp ou data serial Excel
+    def _format_date(self, value: Any, value_str: str, field_type: str) -> str:
+        """Converte datetime(...), timestamps e seriais do Excel em data."""
+        if isinstance(value_str, str):
+            # 1. Caso comum primeiro: float e classificação por magnitude
+            # (timestamp ou data serial do Excel); "datetime(...)" nunca passa no float()
+            try:
+                ts = float(value_str)
+            except ValueError:
+                ts = None
+
+            if ts is not None:
+                # Faixas por magnitude, na ordem de frequência dos dados reais:
+                # 1a. Timestamp em milissegundos (ex: 1715558400000), de ~1973 em diante;
+                # acima do ano 9999 (~253402300799999) o fromtimestamp falha
+                if 100_000_000_000 < ts < 300_000_000_000_000:
                     try:
-                        ts = float(value_str)
-
-                        # 2a. Verificar se é timestamp em milissegundos
-                        # (Ex: 13 dígitos para datas recentes, 1715558400000)
-                        # Limite superior para datas razoáveis em ms (ex: ano 10000)
-                        if (
-                            ts > 100000000000 and ts < 300000000000000
-                        ):  # Approx 1973 to year 10000 in ms
-                            return str(datetime.fromtimestamp(ts / 1000.0))
-
-                        # 2b. Verificar se é timestamp em segundos
-                        # (Ex: 10 dígitos para datas recentes, 1715558400)
-                        if (
-                            ts > 1000000000 and ts < 300000000
-                        ):  # Approx 1973 to year 2038-ish in seconds
-                            return str(datetime.fromtimestamp(ts))
-
-                        # 2c. Verificar se é data serial do Excel (ex: 30000 a 70000 para datas comuns)
-                        # O valor 13717.16 é 1937-07-07. O valor 470 é 1901-04-14.
-                        if 1 < ts < 80000:  # Cobre de 1900-01-01 até bem depois de 2100
-                            try:
-                                delta_days = int(ts)
-                                delta_fraction = ts - delta_days
-                                dt = (
-                                    datetime(1899, 12, 30)
-                                    + timedelta(days=delta_days)
-                                    + timedelta(seconds=delta_fraction * 86400)
-                                )
-                                return str(
-                                    dt.strftime("%Y-%m-%d %H:%M:%S")
-                                    if dt.time() != datetime.min.time()
-                                    else dt.strftime("%Y-%m-%d")
-                                )
-                            except (ValueError, OverflowError) as excel_e:
-                                logger.warning(
-                                    f"Falha ao converter data serial do Excel '{value_str}': {excel_e}"
-                                )
-                                return ""  # Fallback se a conversão Excel falhar
-
-                        # Se chegou aqui como float mas não se encaixou nos padrões acima
+                        return str(datetime.fromtimestamp(ts / 1000.0))
+                    except (ValueError, OverflowError, OSError) as ts_e:
                         logger.warning(
-                            f"Valor numérico '{value_str}' não reconhecido como formato de data válido "
-                            f"(timestamp ou serial Excel)."
+                            f"Falha ao converter timestamp em ms '{value_str}': {ts_e}"
                         )
                         return ""
 
-                    except ValueError:
-                        # Não é float, nem "datetime(...)"
-                        # Outras tentativas de parse (ISO, DD/MM/YYYY) podem ser adicionadas aqui se necessário
-                        logger.debug(
-                            f"Valor '{value_str}' para campo de data não é numérico nem formato 'datetime(...)'."
+                # 1b. Timestamp em segundos (ex: 1715558400), ~2001 até ~2096
+                if 1_000_000_000 < ts < 4_000_000_000:
+                    try:
+                        return str(datetime.fromtimestamp(ts))
+                    except (ValueError, OverflowError, OSError) as ts_e:
+                        logger.warning(
+                            f"Falha ao converter timestamp em segundos '{value_str}': {ts_e}"
                         )
-                        return ""  # Fallback final para strings não reconhecidas
+                        return ""
 
-                elif isinstance(
-                    value, datetime
-                ):  # Se já for datetime (raro neste ponto do fluxo)
-                    return str(value)
+                # 1c. Data serial do Excel (ex: 30000 a 70000 para datas comuns)
+                # O valor 13717.16 é 1937-07-07. O valor 470 é 1901-04-14.
+                if 1 < ts < 80000:  # Cobre de 1900-01-01 até bem depois de 2100
+                    try:
+                        dt = _EXCEL_EPOCH + timedelta(days=ts)
+                        # isoformat é C puro, sem o parse do formato do strftime
+                        return (
+                            dt.isoformat(sep=" ", timespec="seconds")
+                            if dt.time() != _MIDNIGHT
+                            else dt.date().isoformat()
+                        )
+                    except (ValueError, OverflowError) as excel_e:
+                        logger.warning(
+                            f"Falha ao converter data serial do Excel '{value_str}': {excel_e}"
+                        )
+                        return ""  # Fallback se a conversão Excel falhar
 
+                # Se chegou aqui como float mas não se encaixou nos padrões acima
                 logger.warning(
-                    f"Unparseable date value encountered: {value_str} (type: {type(value)}). "
-                    f"Returning empty for Pydantic."
+                    f"Valor numérico '{value_str}' não reconhecido como formato de data válido "
+                    f"(timestamp ou serial Excel)."
                 )
                 return ""
 
-            return value_str.strip()
+            # 2. Tentar formato "datetime(YYYY,MM,DD...)"
+            if "datetime" in value_str.lower():
+                match = _DATETIME_RE.search(value_str)
+                if match:
+                    try:
+                        components_str = match.group(1).split(",")
+                        components = [int(c.strip()) for c in components_str]
+                        if len(components) >= 3:
+                            # Ajustar mês se parecer 0-indexado (improvável com PowerBI, mas seguro)
+                            if components[1] == 0 and len(components) > 1:
+                                components[1] = 1
+                            return str(datetime(*components))
+                        else:
+                            logger.warning(
+                                f"Date string '{value_str}' (datetime format) has insufficient components."
+                            )
+                            return ""
+                    except ValueError as e:
+                        logger.warning(
+                            f"Error parsing datetime components from '{value_str}': {e}"
+                        )
+                        return ""
 
-        except Exception as e:
-            logger.warning(
-                "format_error",
-                value=value_str,
-                original_value_type=str(type(value)),
-                field_type=field_type,
-                error=str(e),
-                exc_info=True,
+            # Não é float, nem "datetime(...)"
+            # Outras tentativas de parse (ISO, DD/MM/YYYY) podem ser adicionadas aqui se necessário
+            logger.debug(
+                f"Valor '{value_str}' para campo de data não é numérico nem formato 'datetime(...)'."
             )
-            if field_type in ["int", "float", "Decimal"]:
-                return "0"
-            if field_type == "date":
-                return ""  # Fallback for errors during date formatting
-            return "-"
+            return ""  # Fallback final para strings não reconhecidas
+
+        elif isinstance(
+            value, datetime
+        ):  # Se já for datetime (raro neste ponto do fluxo)
+            return str(value)
+
+        logger.warning(
+            f"Unparseable date value encountered: {value_str} (type: {type(value)}). "
+            f"Returning empty for Pydantic."
+        )
+        return ""
+
+    def _memoized_format_value(self) -> Callable[[Any, str], str]:
+        """Retorna _format_value memoizado por (tipo, valor bruto, field_type).
+
+        As colunas do DM0 se repetem muito (anos, datas, valores de ValueDicts), então
+        cada valor distinto é convertido uma única vez por chamada de normalize_to_rows.
+        O tipo entra na chave porque 1, 1.0 e True são iguais como chave de dict.
+        """
+        cache: Dict[Tuple[type, Any, str], str] = {}
+        format_value = self._format_value
+
+        def memoized(value: Any, field_type: str) -> str:
+            key = (type(value), value, field_type)
+            try:
+                return cache[key]
+            except KeyError:
+                result = format_value(value, field_type)
+                if field_type == "str":
+                    # Textos de baixa cardinalidade (comarca, natureza, situação...):
+                    # internar faz as linhas de todas as páginas compartilharem o objeto
+                    result = sys.intern(result)
+                cache[key] = result
+                return result
+            except TypeError:  # valor não hashable (lista/dict inesperado em C)
+                return format_value(value, field_type)
+
+        return memoized
+
+    @staticmethod
+    def _memoized_row_validator() -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Retorna um validador de linhas do Precatorio memoizado por campo.
+
+        Os validadores do Precatorio dependem só do valor do próprio campo, e as linhas
+        delta herdam a maior parte dos campos da linha anterior. Por isso cada valor
+        distinto é validado uma única vez por campo e reaproveitado já convertido,
+        como um construct() sobre valores confiáveis. Qualquer erro ou entrada
+        inesperada cai no validate_model completo, que levanta o ValidationError usual.
+        """
+        model_fields = tuple(Precatorio.__fields__.items())
+        cache: Dict[Tuple[str, type, Any], Any] = {}
+
+        def full_validation(row: Dict[str, Any]) -> Dict[str, Any]:
+            values, _, validation_error = validate_model(Precatorio, row)
+            if validation_error:
+                raise validation_error
+            return values
+
+        def validate(row: Dict[str, Any]) -> Dict[str, Any]:
+            values: Dict[str, Any] = {}
+            for name, model_field in model_fields:
+                if name not in row:  # required/default ficam a cargo do validate_model
+                    return full_validation(row)
+                raw = row[name]
+                key = (name, type(raw), raw)
+                try:
+                    values[name] = cache[key]
+                except KeyError:
+                    validated, errors = model_field.validate(
+                        raw, values, loc=name, cls=Precatorio
+                    )
+                    if errors:
+                        return full_validation(row)
+                    values[name] = cache[key] = validated
+                except TypeError:  # valor não hashable
+                    return full_validation(row)
+            return values
+
+        return validate
 
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
@@ -261,44 +524,52 @@ class PrecatoriosCrawler:
         year: Optional[int] = None,
     ) -> Dict:
         """Busca uma página de dados da API."""
-        current_headers = self.session.headers.copy()
-        current_headers.update(
-            {"ActivityId": str(uuid.uuid4()), "RequestId": str(uuid.uuid4())}
-        )
-
-        payload = self.get_precatorios_payload(
-            entity_slug_or_official_name=entity,
-            count=(count if count is not None else self.config_instance.batch_size),
-            restart_tokens=restart_tokens,
+        config_instance = self.config_instance
+        session_post = self.session.post
+        # Só os IDs mudam por requisição; o requests já mescla os headers da sessão
+        current_headers = {
+            "ActivityId": fast_request_id(),
+            "RequestId": fast_request_id(),
+        }
+
+        effective_count = count if count is not None else config_instance.batch_size
+        logger.info(
+            "fetch_page_request",
+            entity=entity,
+            count=effective_count,
             year=year,
+            has_restart_tokens=bool(restart_tokens),
         )
 
-        try:
-            # Tentativa de log mais seguro, verificando a existência das chaves
-            binding_details = (
-                payload.get("Queries", [{}])[0]
-                .get("Query", {})
-                .get("Commands", [{}])[0]
-                .get("SemanticQueryDataStructure", {})
-                .get("Binding")
-            )
-            if binding_details:
-                logger.info(
-                    "fetch_page_request_binding", binding_details=binding_details
-                )
-            else:
-                logger.warning("Binding details not found in payload for logging.")
-        except (
-            Exception
-        ) as log_e:  # Pega exceção genérica para o log não quebrar a função
-            logger.warning(f"Could not log binding details due to an error: {log_e}")
-
         REQUESTS_TOTAL.labels(entity=entity).inc()
-        response = self.session.post(
-            self.api_url, json=payload, headers=current_headers, timeout=180
-        )  # Timeout aumentado para 180s
+        if config_instance.payload_template_enabled:
+            body = self._render_payload_body(
+                entity_slug_or_official_name=entity,
+                count=effective_count,
+                year=year,
+                restart_tokens=restart_tokens,
+            )
+            response = session_post(
+                self.api_url,
+                data=body.encode("utf-8"),
+                headers=current_headers,
+                timeout=180,
+            )  # Timeout aumentado para 180s
+        else:
+            payload = self.get_precatorios_payload(
+                entity_slug_or_official_name=entity,
+                count=effective_count,
+                restart_tokens=restart_tokens,
+                year=year,
+            )
+            response = session_post(
+                self.api_url,
+                data=orjson.dumps(payload),
+                headers=current_headers,
+                timeout=180,
+            )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def get_precatorios_payload(
         self,
@@ -309,7 +580,39 @@ class PrecatoriosCrawler:
         restart_tokens: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """Prepara o payload para a requisição de precatórios, incluindo filtros e paginação."""
-        payload = deepcopy(self.base_payload)
+        api_entity_name = get_api_entity_name(entity_slug_or_official_name)
+        if not api_entity_name:
+            logger.error(
+                f"Nome oficial da API não encontrado para: {entity_slug_or_official_name}"
+            )
+            raise ValueError(
+                f"Slug ou nome da entidade inválido: {entity_slug_or_official_name}"
+            )
+        effective_count = (
+            count
+            if count is not None and count > 0
+            else self.config_instance.batch_size
+        )
+        return self._build_payload(
+            api_entity_name=api_entity_name,
+            effective_count=effective_count,
+            year=year,
+            restart_tokens=restart_tokens,
+        )
+
+    def _build_payload(
+        self,
+        api_entity_name: str,
+        effective_count: Union[int, str],
+        year: Optional[Union[int, str]] = None,
+        restart_tokens: Optional[Union[List[Any], str]] = None,
+    ) -> Dict[str, Any]:
+        """Monta o payload a partir de PAYLOAD_STRUCTURE com valores já resolvidos.
+
+        Aceita sentinelas (str) no lugar dos valores para gerar os templates serializados.
+        """
+        payload = orjson.loads(self._base_payload_json)
+        debug_enabled = _debug_enabled()
 
         try:
             # Ajustado o caminho para SemanticQueryDataShapeCommand
@@ -354,10 +657,9 @@ class PrecatoriosCrawler:
 
         # Configurações de Binding, DataReduction, e Window no local correto
         try:
-            binding_for_window = command_structure["Binding"]
-            data_reduction = binding_for_window["DataReduction"]
-            primary_reduction = data_reduction["Primary"]
-            window_to_modify = primary_reduction["Window"]
+            window_to_modify = command_structure["Binding"]["DataReduction"][
+                "Primary"
+            ]["Window"]
         except KeyError as e:
             logger.error(
                 f"Estrutura de payload esperada não encontrada ao tentar acessar Window: {e}. "
@@ -369,11 +671,6 @@ class PrecatoriosCrawler:
                 f"Estrutura de payload inválida para Window, chave ausente: {e}"
             )
 
-        effective_count = (
-            count
-            if count is not None and count > 0
-            else self.config_instance.batch_size
-        )
         window_to_modify["Count"] = effective_count
 
         if restart_tokens:
@@ -382,22 +679,11 @@ class PrecatoriosCrawler:
             del window_to_modify["RestartTokens"]
 
         # Filtro de Entidade e Ano
-        api_entity_name = get_api_entity_name(entity_slug_or_official_name)
-        if not api_entity_name:
-            logger.error(
-                f"Nome oficial da API não encontrado para: {entity_slug_or_official_name}"
-            )
-            raise ValueError(
-                f"Slug ou nome da entidade inválido: {entity_slug_or_official_name}"
-            )
-
         # Corrigir o acesso à cláusula Where
         query_definition = command_structure[
             "Query"
         ]  # command_structure é SemanticQueryDataShapeCommand
-
-        if "Where" not in query_definition:
-            query_definition["Where"] = []
+        existing_filters = query_definition.get("Where", [])
 
         # Remover filtros de entidade preexistentes para evitar duplicidade ou conflito.
         preserved_filters = []
@@ -405,13 +691,13 @@ class PrecatoriosCrawler:
             "dfslcp_nom_entidade_devedora",
             "dfslcp_dsc_entidade",
         ]  # Nomes comuns para colunas de entidade
-        for item_filter in query_definition["Where"]:
+        for item_filter in existing_filters:
             is_entity_filter = False
             try:
+                condition = item_filter.get("Condition", {})
                 # Checa se o filtro atual é um filtro de entidade (Comparison)
                 if (
-                    item_filter.get("Condition", {})
-                    .get("Comparison", {})
+                    condition.get("Comparison", {})
                     .get("Left", {})
                     .get("Column", {})
                     .get("Property")
@@ -419,16 +705,14 @@ class PrecatoriosCrawler:
                 ):
                     is_entity_filter = True
                 # Checa se o filtro atual é um filtro de entidade (In)
-                elif (
-                    item_filter.get("Condition", {}).get("In", {})
-                    and isinstance(item_filter["Condition"]["In"]["Expressions"], list)
-                    and len(item_filter["Condition"]["In"]["Expressions"]) > 0
-                    and item_filter["Condition"]["In"]["Expressions"][0]
-                    .get("Column", {})
-                    .get("Property")
-                    in entity_column_names
-                ):
-                    is_entity_filter = True
+                elif condition.get("In", {}):
+                    in_expressions = condition["In"]["Expressions"]
+                    is_entity_filter = (
+                        isinstance(in_expressions, list)
+                        and len(in_expressions) > 0
+                        and in_expressions[0].get("Column", {}).get("Property")
+                        in entity_column_names
+                    )
             except (KeyError, TypeError, AttributeError):
                 logger.warning(
                     "Could not reliably determine if a filter is an entity filter due to structure.",
@@ -438,9 +722,9 @@ class PrecatoriosCrawler:
             if not is_entity_filter:
                 preserved_filters.append(item_filter)
             else:
-                logger.debug(f"Removing pre-existing entity filter: {item_filter}")
+                if debug_enabled:
+                    logger.debug(f"Removing pre-existing entity filter: {item_filter}")
 
-        query_definition["Where"] = preserved_filters
         new_filters = list(
             preserved_filters
         )  # Começa com os filtros não-entidade preservados
@@ -463,9 +747,10 @@ class PrecatoriosCrawler:
                 }
             }
         )
-        logger.debug(
-            f"Added new entity filter for '{api_entity_name}' on property 'dfslcp_dsc_entidade' using 'In' structure."
-        )
+        if debug_enabled:
+            logger.debug(
+                f"Added new entity filter for '{api_entity_name}' on property 'dfslcp_dsc_entidade' using 'In' structure."
+            )
 
         # Filtros de ano
         # Remove qualquer filtro de ano existente dos new_filters antes de adicionar o novo (se houver)
@@ -504,20 +789,21 @@ class PrecatoriosCrawler:
                     }
                 }
             )
-            logger.debug(f"Added year filter: {year}")
-        else:
+            if debug_enabled:
+                logger.debug(f"Added year filter: {year}")
+        elif debug_enabled:
             logger.debug("No year filter applied as year was not provided.")
 
         query_definition["Where"] = new_filters
-        logger.debug(f"Final filters for Where clause: {query_definition['Where']}")
-
-        logger.debug(
-            "Final payload generated",
-            entity=api_entity_name,
-            count=effective_count,
-            year=year,
-            has_restart_tokens=bool(restart_tokens),
-        )
+        if debug_enabled:
+            logger.debug(f"Final filters for Where clause: {new_filters}")
+            logger.debug(
+                "Final payload generated",
+                entity=api_entity_name,
+                count=effective_count,
+                year=year,
+                has_restart_tokens=bool(restart_tokens),
+            )
         return payload
 
     @track_time
@@ -528,14 +814,30 @@ class PrecatoriosCrawler:
         year: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Busca todos os dados de precatórios para uma entidade, paginando automaticamente."""
+        return list(
+            self.iter_all_precatorios_rows(
+                entity_slug_or_official_name, count_per_page=count_per_page, year=year
+            )
+        )
+
+    def iter_all_precatorios_rows(
+        self,
+        entity_slug_or_official_name: str,
+        count_per_page: Optional[int] = None,
+        year: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Versão em streaming de fetch_all_precatorios_data: gera as linhas página a página.
+
+        Só a página corrente fica em memória, o que permite escrever o CSV de entidades
+        grandes sem acumular todas as linhas.
+        """
         api_entity_name = get_api_entity_name(entity_slug_or_official_name)
         if not api_entity_name:
             logger.error(
                 "entity_not_found_in_mapping", entity=entity_slug_or_official_name
             )
-            return []
+            return
 
-        all_normalized_rows: List[Dict[str, Any]] = []
         current_restart_tokens: Optional[List[Any]] = None
         page_num = 0
         processed_records_for_entity = 0
@@ -553,82 +855,118 @@ class PrecatoriosCrawler:
             year_filter=year,
         )
 
-        while True:
-            page_num += 1
-            logger.info(
-                "fetching_page",
-                entity=api_entity_name,
-                page=page_num,
-                current_total_fetched=len(all_normalized_rows),
-                has_restart_tokens=bool(current_restart_tokens),
-            )
-            try:
-                page_data_response = self._fetch_page(
+        # Uma thread dedicada busca a página seguinte em paralelo à normalização
+        prefetcher: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=1)
+            if self.config_instance.page_prefetch_enabled
+            else None
+        )
+        next_page_future: Optional[Future] = None
+        try:
+            while True:
+                page_num += 1
+                logger.info(
+                    "fetching_page",
                     entity=api_entity_name,
-                    restart_tokens=current_restart_tokens,
-                    count=batch_size,
-                    year=year,
+                    page=page_num,
+                    current_total_fetched=processed_records_for_entity,
+                    has_restart_tokens=bool(current_restart_tokens),
                 )
-                if (
-                    not page_data_response
-                    or "results" not in page_data_response
-                    or not page_data_response["results"]
-                ):
-                    logger.warning(
-                        "empty_or_invalid_response_from_api",
-                        entity=api_entity_name,
-                        page=page_num,
+                try:
+                    if next_page_future is not None:
+                        page_data_response = next_page_future.result()
+                        next_page_future = None
+                    else:
+                        page_data_response = self._fetch_page(
+                            entity=api_entity_name,
+                            restart_tokens=current_restart_tokens,
+                            count=batch_size,
+                            year=year,
+                        )
+                    if (
+                        not page_data_response
+                        or "results" not in page_data_response
+                        or not page_data_response["results"]
+                    ):
+                        logger.warning(
+                            "empty_or_invalid_response_from_api",
+                            entity=api_entity_name,
+                            page=page_num,
+                        )
+                        break
+
+                    # Resolve o DS da página uma única vez (ValueDicts e RT saem dele)
+                    page_ds_error: Optional[str] = None
+                    try:
+                        page_ds = page_data_response["results"][0]["result"]["data"][
+                            "dsr"
+                        ]["DS"][0]
+                    except (KeyError, IndexError, TypeError) as e:
+                        page_ds = None
+                        page_ds_error = str(e)
+
+                    # O RT já chegou: a próxima página é buscada enquanto esta é
+                    # normalizada e consumida (as páginas seguem sequenciais entre si)
+                    new_restart_tokens = page_ds.get("RT") if page_ds is not None else None
+                    if (
+                        prefetcher is not None
+                        and new_restart_tokens
+                        and new_restart_tokens != current_restart_tokens
+                    ):
+                        next_page_future = prefetcher.submit(
+                            self._fetch_page,
+                            entity=api_entity_name,
+                            restart_tokens=new_restart_tokens,
+                            count=batch_size,
+                            year=year,
+                        )
+
+                    # A função normalize_to_rows espera uma lista de respostas de página
+                    normalized_page_rows, last_order_number_from_page = (
+                        self.normalize_to_rows(
+                            [page_data_response], starting_order_number=last_order_number
+                        )
                     )
-                    break
+                    last_order_number = last_order_number_from_page
 
-                # A função normalize_to_rows espera uma lista de respostas de página
-                normalized_page_rows, last_order_number_from_page = (
-                    self.normalize_to_rows(
-                        [page_data_response], starting_order_number=last_order_number
+                    if not normalized_page_rows:  # Se a normalização não retornar linhas
+                        raw_data_present = bool(page_ds and page_ds.get("ValueDicts"))
+                        if raw_data_present:
+                            logger.info(
+                                "page_had_raw_data_but_normalized_to_empty",
+                                entity=api_entity_name,
+                                page=page_num,
+                            )
+                        else:
+                            logger.info(
+                                "no_more_records_or_empty_page_after_normalization",
+                                entity=api_entity_name,
+                                page=page_num,
+                            )
+                        break  # Interrompe se não houver mais dados normalizados
+
+                    yield from normalized_page_rows
+                    processed_records_for_entity += len(normalized_page_rows)
+                    RECORDS_PROCESSED.labels(entity=api_entity_name).inc(
+                        len(normalized_page_rows)
                     )
-                )
-                last_order_number = last_order_number_from_page
-
-                if not normalized_page_rows:  # Se a normalização não retornar linhas
-                    raw_data_present = bool(
-                        page_data_response["results"][0]
-                        .get("result", {})
-                        .get("data", {})
-                        .get("dsr", {})
-                        .get("DS", [{}])[0]
-                        .get("ValueDicts")
+                    logger.info(
+                        "page_processed_and_normalized",
+                        entity=api_entity_name,
+                        page=page_num,
+                        recs_in_page=len(normalized_page_rows),
+                        total_recs=processed_records_for_entity,
                     )
-                    if raw_data_present:
-                        logger.info(
-                            "page_had_raw_data_but_normalized_to_empty",
-                            entity=api_entity_name,
-                            page=page_num,
-                        )
-                    else:
-                        logger.info(
-                            "no_more_records_or_empty_page_after_normalization",
+
+                    if page_ds is None:
+                        logger.warning(
+                            "error_extracting_restart_tokens_from_response",
                             entity=api_entity_name,
                             page=page_num,
+                            error=page_ds_error,
                         )
-                    break  # Interrompe se não houver mais dados normalizados
-
-                all_normalized_rows.extend(normalized_page_rows)
-                processed_records_for_entity += len(normalized_page_rows)
-                RECORDS_PROCESSED.labels(entity=api_entity_name).inc(
-                    len(normalized_page_rows)
-                )
-                logger.info(
-                    "page_processed_and_normalized",
-                    entity=api_entity_name,
-                    page=page_num,
-                    recs_in_page=len(normalized_page_rows),
-                    total_recs=processed_records_for_entity,
-                )
+                        break
 
-                try:
-                    new_restart_tokens = page_data_response["results"][0]["result"][
-                        "data"
-                    ]["dsr"]["DS"][0].get("RT")
                     if new_restart_tokens:
                         if new_restart_tokens == current_restart_tokens:
                             logger.warning(
@@ -650,39 +988,148 @@ class PrecatoriosCrawler:
                             page=page_num,
                         )
                         break
-                except (KeyError, IndexError, TypeError) as e:
-                    logger.warning(
-                        "error_extracting_restart_tokens_from_response",
+                except requests.exceptions.RequestException as e:
+                    logger.error(
+                        "fetch_page_request_failed_halting_pagination",
                         entity=api_entity_name,
                         page=page_num,
                         error=str(e),
                     )
                     break
-            except requests.exceptions.RequestException as e:
-                logger.error(
-                    "fetch_page_request_failed_halting_pagination",
-                    entity=api_entity_name,
-                    page=page_num,
-                    error=str(e),
-                )
-                break
-            except Exception as e:
-                logger.error(
-                    "unexpected_error_in_pagination_loop_halting",
-                    entity=api_entity_name,
-                    page=page_num,
-                    error=str(e),
-                    exc_info=True,
-                )
-                break
+                except Exception as e:
+                    logger.error(
+                        "unexpected_error_in_pagination_loop_halting",
+                        entity=api_entity_name,
+                        page=page_num,
+                        error=str(e),
+                        exc_info=True,
+                    )
+                    break
+
+        finally:
+            # Página especulativa não consumida (fim, erro ou gerador fechado) é descartada
+            if prefetcher is not None:
+                prefetcher.shutdown(wait=False, cancel_futures=True)
 
         logger.info(
             "finished_full_precatorios_fetch",
             entity=api_entity_name,
             pages_fetched=page_num,
-            total_recs_aggregated=len(all_normalized_rows),
+            total_recs_aggregated=processed_records_for_entity,
         )
-        return all_normalized_rows
+
+    def fetch_many_precatorios_data(
+        self,
+        entity_slugs_or_official_names: List[str],
+        count_per_page: Optional[int] = None,
+        year: Optional[int] = None,
+        max_workers: int = 8,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Busca os precatórios de várias entidades em paralelo, compartilhando a sessão HTTP.
+
+        A paginação de cada entidade continua sequencial (depende dos RestartTokens);
+        o paralelismo é entre entidades. Retorna {entidade: linhas} na ordem de entrada;
+        entidades repetidas são buscadas uma única vez.
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        # Sem duplicatas: cada entidade vira um único future, na ordem de entrada
+        unique_entities = list(dict.fromkeys(entity_slugs_or_official_names))
+        if not unique_entities:
+            return results
+
+        workers = max(1, min(max_workers, len(unique_entities)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self.fetch_all_precatorios_data,
+                    entity_slug_or_official_name=entity,
+                    count_per_page=count_per_page,
+                    year=year,
+                ): entity
+                for entity in unique_entities
+            }
+            for future in as_completed(futures):
+                entity = futures[future]
+                try:
+                    results[entity] = future.result()
+                except Exception as e:
+                    logger.error(
+                        "fetch_many_entity_failed",
+                        entity=entity,
+                        error=str(e),
+                        exc_info=True,
+                    )
+                    results[entity] = []
+
+        return {entity: results[entity] for entity in unique_entities}
+
+    def _resolve_page_columns(
+        self,
+        s_schema: List[Dict[str, Any]],
+        descriptor_selects: List[Dict[str, Any]],
+        value_dicts: Dict[str, Any],
+        page_index: int,
+    ) -> List[Optional[_ColumnTarget]]:
+        """Resolve, por coluna do schema 'S', o campo CSV, o tipo e o ValueDict (DN).
+
+        O schema, o descritor e os ValueDicts são fixos na página, então nome base,
+        mapeamento e a lista do DN são resolvidos uma vez aqui em vez de a cada linha.
+        Colunas sem descritor ou sem mapeamento ficam como None e são ignoradas
+        pelas linhas; um DN ausente dos ValueDicts (ou que não seja lista) fica com
+        lista None e cai no fallback das linhas.
+        """
+        api_name_to_csv_field_map = self._api_name_to_csv_field_map
+        column_targets: List[Optional[_ColumnTarget]] = []
+        for col_idx, schema_item in enumerate(s_schema):
+            # O índice 'col_idx' é o mesmo para s_schema, C e descriptor_selects
+            if col_idx >= len(descriptor_selects):
+                logger.warning(
+                    f"Pág{page_index},C{col_idx}: Idx OOB for global_descriptors. Skip field."
+                )
+                column_targets.append(None)
+                continue
+            base_api_name = self._get_base_field_name(
+                descriptor_selects[col_idx].get("Name")
+            )
+            csv_field_cfg = api_name_to_csv_field_map.get(base_api_name)
+            if not csv_field_cfg:
+                column_targets.append(None)
+                continue
+            dict_name = schema_item.get("DN")
+            vd_list = value_dicts.get(dict_name) if dict_name else None
+            column_targets.append(
+                (
+                    csv_field_cfg["csv_field"],
+                    csv_field_cfg["type"],
+                    dict_name,
+                    vd_list if isinstance(vd_list, list) else None,
+                )
+            )
+        return column_targets
+
+    def _log_missing_dm0_level(self, resp_json: Dict, page_index: int) -> None:
+        """Loga qual nível de results/result/data/dsr/DS/PH/DM0 está ausente na página."""
+        data = resp_json.get("results", [{}])[0].get("result", {}).get("data", {})
+        if not data:
+            logger.warning("Pág %s: Sem 'data' no resultado.", page_index)
+            return
+
+        dsr = data.get("dsr")
+        if not dsr:
+            logger.warning("Pág %s: Sem 'dsr' nos dados.", page_index)
+            return
+
+        current_ds_list = dsr.get("DS", [])
+        if not current_ds_list:
+            logger.warning(f"Pág {page_index}: 'DS' está vazio ou ausente.")
+            return
+
+        ph_list = current_ds_list[0].get("PH", [])
+        if not ph_list:
+            logger.warning(f"Pág {page_index}: 'PH' está vazio ou ausente.")
+            return
+
+        logger.warning("Pág %s: Sem 'DM0' (container de linhas).", page_index)
 
     def normalize_to_rows(
         self, resp_json_pages: List[Dict], starting_order_number: int = 0
@@ -690,15 +1137,37 @@ class PrecatoriosCrawler:
         """Normaliza os dados JSON da API para uma lista de dicionários (linhas).
         Retorna as linhas normalizadas e o último número de ordem usado.
         """
-        normalized_rows: List[Dict] = []
+        normalized_rows = list(
+            self.iter_normalized_rows(resp_json_pages, starting_order_number)
+        )
+        # A ordem avança uma unidade por linha normalizada
+        return normalized_rows, starting_order_number + len(normalized_rows)
+
+    def iter_normalized_rows(
+        self, resp_json_pages: List[Dict], starting_order_number: int = 0
+    ) -> Iterator[Dict]:
+        """Versão em streaming de normalize_to_rows: gera as linhas uma a uma.
+
+        Permite escrever o CSV sem manter todas as linhas em memória.
+        """
+        normalized_count = 0
         total_raw_records_count = 0
+        validate_row = self._memoized_row_validator()
+        format_value = self._memoized_format_value()
+        decode_utf8 = self._decode_utf8
+        debug_enabled = _debug_enabled()
+        default_row: Dict[str, Any] = dict(self._default_row)
         current_order_in_normalized_list = starting_order_number
 
         if not resp_json_pages or not isinstance(resp_json_pages, list):
             logger.warning(
                 "normalize_to_rows_entrada_invalida", data=str(resp_json_pages)
             )
-            return normalized_rows, current_order_in_normalized_list
+            return
+
+        records_counter = RECORDS_PROCESSED.labels(
+            entity=getattr(self, "current_entity_slug", "unknown_entity_norm")
+        )
 
         for page_index, resp_json in enumerate(resp_json_pages):
             if not resp_json or not isinstance(resp_json, dict):
@@ -709,40 +1178,25 @@ class PrecatoriosCrawler:
                 )
                 continue
 
+            page_start_count = normalized_count
             try:
-                data = (
-                    resp_json.get("results", [{}])[0].get("result", {}).get("data", {})
-                )
-                if not data:
-                    logger.warning("Pág %s: Sem 'data' no resultado.", page_index)
-                    continue
-
-                dsr = data.get("dsr")
-                if not dsr:
-                    logger.warning("Pág %s: Sem 'dsr' nos dados.", page_index)
-                    continue
-
-                current_ds_list = dsr.get("DS", [])
-                if not current_ds_list:
-                    logger.warning(f"Pág {page_index}: 'DS' está vazio ou ausente.")
-                    continue
-
-                current_ds = current_ds_list[0]
-                value_dicts = current_ds.get("ValueDicts", {})
-
-                ph_list = current_ds.get("PH", [])
-                if not ph_list:
-                    logger.warning(f"Pág {page_index}: 'PH' está vazio ou ausente.")
+                # Caminho comum: acesso direto; a cascata defensiva com logs só roda na falha
+                try:
+                    data = resp_json["results"][0]["result"]["data"]
+                    current_ds = data["dsr"]["DS"][0]
+                    data_rows_container = current_ds["PH"][0]["DM0"]
+                except (KeyError, IndexError, TypeError):
+                    self._log_missing_dm0_level(resp_json, page_index)
                     continue
-                ph = ph_list[0]
 
-                data_rows_container = ph.get("DM0")
                 if data_rows_container is None:
                     logger.warning(
                         "Pág %s: Sem 'DM0' (container de linhas).", page_index
                     )
                     continue
 
+                value_dicts = current_ds.get("ValueDicts", {})
+
                 if (
                     isinstance(data_rows_container, list)
                     and len(data_rows_container) == 1
@@ -761,16 +1215,6 @@ class PrecatoriosCrawler:
                     )
                     continue
 
-                api_name_to_csv_field_map: Dict[str, Dict[str, str]] = {}
-                for csv_fld, attrs in self.field_config_instance.field_mapping.items():
-                    api_n = attrs.get("api_name")
-                    if api_n:
-                        api_name_to_csv_field_map[api_n] = {
-                            "csv_field": csv_fld,
-                            "type": attrs.get("type", "str"),
-                            "default": attrs.get("default"),
-                        }
-
                 data_rows = (
                     data_rows_container if isinstance(data_rows_container, list) else []
                 )
@@ -786,32 +1230,27 @@ class PrecatoriosCrawler:
                 )
 
                 s_schema = None  # Schema da primeira linha da página
+                # Destino de cada coluna do schema, resolvido uma vez por página
+                column_targets: List[Optional[_ColumnTarget]] = []
                 last_processed_pydantic_row: Dict[str, Any] = {}
 
                 for i, raw_row_data_container in enumerate(data_rows):
-                    pydantic_input_row: Dict[str, Any] = {}
-                    # Inicializa com defaults do field_config para garantir que todos os campos CSV existam
-                    for (
-                        csv_f_init,
-                        csv_attrs_init,
-                    ) in self.field_config_instance.field_mapping.items():
-                        pydantic_input_row[csv_f_init] = self._format_value(
-                            csv_attrs_init.get("default"),
-                            csv_attrs_init.get("type", "str"),
-                        )
-
-                    current_c_values = raw_row_data_container.get("C", [])
+                    current_c_values = raw_row_data_container.get("C") or _EMPTY_VALUES
 
                     if i == 0:  # Linha Base
+                        # Inicializa com defaults do field_config para garantir que todos os campos CSV existam
+                        pydantic_input_row: Dict[str, Any] = default_row.copy()
                         current_s_list_from_row = raw_row_data_container.get("S")
-                        if not current_s_list_from_row or not isinstance(
-                            current_s_list_from_row, list
-                        ):
+                        # Power BI devolve lista ou nada aqui: lista vazia e None são falsy
+                        if not current_s_list_from_row:
                             logger.error(
                                 f"Pág {page_index}, Linha {i} (base): schema 'S' inválido. Pulando página."
                             )
                             break
                         s_schema = current_s_list_from_row
+                        column_targets = self._resolve_page_columns(
+                            s_schema, global_descriptor_selects, value_dicts, page_index
+                        )
 
                         if len(current_c_values) != len(s_schema):
                             logger.error(
@@ -821,78 +1260,77 @@ class PrecatoriosCrawler:
                             last_processed_pydantic_row = {}
                             continue
 
-                        for col_idx, schema_item in enumerate(s_schema):
-                            if col_idx >= len(current_c_values):  # Segurança adicional
-                                logger.warning(
-                                    f"Pág{page_index},L{i},C{col_idx}:C idx OOB.Skip."
-                                )
+                        # C e S têm o mesmo tamanho aqui, então o índice da coluna vale para ambos
+                        for col_idx, column_target in enumerate(column_targets):
+                            if column_target is None:
                                 continue
-                            raw_value_for_field = current_c_values[col_idx]
-                            # Obter informações do descritor global e mapeamento CSV
-                            # O índice 'col_idx' é o mesmo para s_schema, current_c_values e global_descriptor_selects
-                            if col_idx >= len(global_descriptor_selects):
-                                logger.warning(
-                                    f"Pág{page_index},L{i},C{col_idx}: Idx OOB for global_descriptors. Skip field."
-                                )
-                                continue
-
-                            api_name_from_descriptor = global_descriptor_selects[
-                                col_idx
-                            ].get("Name")
-                            base_api_name = self._get_base_field_name(
-                                api_name_from_descriptor
+                            target_csv_field, target_field_type, dict_name, vd_list = (
+                                column_target
                             )
-                            csv_field_cfg = api_name_to_csv_field_map.get(base_api_name)
-
-                            if not csv_field_cfg:
-                                # logger.debug(f"Pág{page_index},L{i},C{col_idx}: API name not mapped. Skip.")
-                                continue
-
-                            target_csv_field = csv_field_cfg["csv_field"]
-                            target_field_type = csv_field_cfg["type"]
-                            dict_name = schema_item.get("DN")
+                            raw_value_for_field = current_c_values[col_idx]
                             val_to_assign = None
                             resolved_value = False
 
                             if dict_name:
                                 try:
-                                    actual_idx = int(raw_value_for_field)
-                                    vd_list = value_dicts.get(dict_name)
-                                    if isinstance(
-                                        vd_list, list
-                                    ) and 0 <= actual_idx < len(vd_list):
+                                    # Índices já chegam como int do JSON; int() fica para o resto
+                                    actual_idx = (
+                                        raw_value_for_field
+                                        if type(raw_value_for_field) is int
+                                        else int(raw_value_for_field)
+                                    )
+                                    if vd_list is not None and 0 <= actual_idx < len(
+                                        vd_list
+                                    ):
                                         val_to_assign = vd_list[actual_idx]
                                         resolved_value = True
                                     else:
-                                        len_val = (
-                                            len(vd_list)
-                                            if vd_list is not None
-                                            else "N/A"
-                                        )
                                         logger.warning(
-                                            f"Pág{page_index},L{i}C{col_idx}({target_csv_field}):"
-                                            f"VD '{dict_name}',C idx'{raw_value_for_field}'OOB(len:{len_val}).Default."
+                                            "value_dict_indice_fora_do_limite_default",
+                                            page_index=page_index,
+                                            row_index=i,
+                                            col_index=col_idx,
+                                            csv_field=target_csv_field,
+                                            dict_name=dict_name,
+                                            raw_value=raw_value_for_field,
+                                            list_len=(
+                                                len(vd_list)
+                                                if vd_list is not None
+                                                else None
+                                            ),
                                         )
                                 except (ValueError, TypeError):
                                     logger.warning(
-                                        f"Pág{page_index},L{i}C{col_idx}({target_csv_field}):"
-                                        f"VD '{dict_name}',C val'{raw_value_for_field}'not int.Default."
+                                        "value_dict_indice_nao_inteiro_default",
+                                        page_index=page_index,
+                                        row_index=i,
+                                        col_index=col_idx,
+                                        csv_field=target_csv_field,
+                                        dict_name=dict_name,
+                                        raw_value=raw_value_for_field,
                                     )
                             else:  # No DN, valor literal de C
                                 val_to_assign = raw_value_for_field
                                 resolved_value = True
 
                             if resolved_value:
+                                # str() só para não-str: no cache, 1 e 1.0 seriam a mesma chave
                                 decoded = (
-                                    self._decode_utf8(str(val_to_assign))
+                                    decode_utf8(
+                                        val_to_assign
+                                        if type(val_to_assign) is str
+                                        else str(val_to_assign)
+                                    )
                                     if val_to_assign is not None
                                     else None
                                 )
                                 pydantic_input_row[target_csv_field] = (
-                                    self._format_value(decoded, target_field_type)
+                                    format_value(decoded, target_field_type)
                                 )
 
-                        last_processed_pydantic_row = pydantic_input_row.copy()
+                        # Sem cópia: a linha não é mais alterada (a validação devolve um
+                        # dict novo) e a próxima delta parte de uma cópia dela
+                        last_processed_pydantic_row = pydantic_input_row
 
                     else:  # Linhas Delta (i > 0)
                         if (
@@ -915,162 +1353,115 @@ class PrecatoriosCrawler:
                             )
                             pydantic_input_row = last_processed_pydantic_row.copy()
                         else:
-                            c_delta_idx = 0
-                            current_c_values_delta = raw_row_data_container.get("C", [])
+                            current_c_values_delta = current_c_values
 
                             # Inicializa pydantic_input_row como uma cópia da linha anterior processada
                             # antes de aplicar as modificações do Rulifier.
                             pydantic_input_row = last_processed_pydantic_row.copy()
 
-                            logger.debug(
-                                f"Pág{page_index},L{i} Delta: R={rulifier_r}({bin(rulifier_r)}), "
-                                f"C_delta={current_c_values_delta}"
-                            )
-
-                            for col_idx, schema_item in enumerate(s_schema):
-                                if col_idx >= len(
-                                    global_descriptor_selects
-                                ):  # Segurança
-                                    logger.warning(
-                                        f"Pág{page_index},L{i} Delta,C{col_idx}: Idx OOB for global_desc. Skip."
-                                    )
-                                    continue
-
-                                api_name_from_descriptor = global_descriptor_selects[
-                                    col_idx
-                                ].get("Name")
-                                base_api_name = self._get_base_field_name(
-                                    api_name_from_descriptor
+                            if debug_enabled:
+                                logger.debug(
+                                    f"Pág{page_index},L{i} Delta: R={rulifier_r}({bin(rulifier_r)}), "
+                                    f"C_delta={current_c_values_delta}"
                                 )
-                                csv_field_cfg = api_name_to_csv_field_map.get(
-                                    base_api_name
+
+                            # Bit 0 (Clear) = Novo Valor, Bit 1 (Set) = Herdar.
+                            # C_delta traz, em ordem, um valor para cada coluna com bit 0; as
+                            # demais já estão herdadas na cópia acima.
+                            present_cols = self._present_columns(
+                                rulifier_r, len(s_schema)
+                            )
+                            if len(present_cols) > len(current_c_values_delta):
+                                logger.error(
+                                    f"Pág{page_index},L{i}Del: R pede {len(present_cols)} valores novos,"
+                                    f" C_delta tem {len(current_c_values_delta)}. Herdando o restante."
                                 )
 
-                                if not csv_field_cfg:
-                                    # logger.debug(f"Pág{page_index},L{i} Delta,C{col_idx}: API name not mapped. Skip.")
+                            for col_idx, raw_value_from_c in zip(
+                                present_cols, current_c_values_delta
+                            ):
+                                column_target = column_targets[col_idx]
+                                if column_target is None:
                                     continue
-
-                                target_csv_field = csv_field_cfg["csv_field"]
-                                target_field_type = csv_field_cfg["type"]
-
-                                # Checa o bit correspondente no Rulifier
-                                # Bit 0 (Clear) = Novo Valor, Bit 1 (Set) = Herdar
-                                if not (
-                                    (rulifier_r >> col_idx) & 1
-                                ):  # Bit é 0, Novo valor de C_delta
-                                    if c_delta_idx >= len(current_c_values_delta):
-                                        logger.error(
-                                            f"Pág{page_index},L{i}Del({target_csv_field}):R bit0 (Novo),"
-                                            f"C_delta OOB(idx{c_delta_idx}). Herdando."
-                                        )
-                                        pydantic_input_row[target_csv_field] = (
-                                            last_processed_pydantic_row.get(
-                                                target_csv_field,
-                                                self._format_value(
-                                                    csv_field_cfg.get("default"),
-                                                    target_field_type,
-                                                ),
+                                (
+                                    target_csv_field,
+                                    target_field_type,
+                                    dict_name,
+                                    vd_list,
+                                ) = column_target
+
+                                # Se o raw_value_from_c for uma string, é um valor direto (ou um valor formatado que deve ser tratado como string inicialmente)
+                                if isinstance(raw_value_from_c, str):
+                                    processed_value = format_value(
+                                        raw_value_from_c, target_field_type
+                                    )
+                                    pydantic_input_row[target_csv_field] = (
+                                        processed_value
+                                    )
+                                    # logger.debug(f"  L{i}Del({target_csv_field}):R bit0(Novo), C{col_idx}='{raw_value_from_c}' (STR Direto) -> '{processed_value}'")
+                                elif isinstance(raw_value_from_c, (int, float)):
+                                    # Caso 1: É um índice para um ValueDict
+                                    if dict_name:
+                                        if (
+                                            vd_list is not None
+                                            and isinstance(raw_value_from_c, int)
+                                            and 0 <= raw_value_from_c < len(vd_list)
+                                        ):
+                                            val_from_dict = vd_list[raw_value_from_c]
+                                            processed_value = format_value(
+                                                val_from_dict, target_field_type
                                             )
-                                        )
-                                        # Não incrementa c_delta_idx aqui pois não consumiu
-                                        continue  # Pula para o próximo col_idx
-
-                                    raw_value_from_c = current_c_values_delta[
-                                        c_delta_idx
-                                    ]
-                                    schema_item = s_schema[col_idx]
-                                    target_field_type = csv_field_cfg.get("type", "str")
-
-                                    # Se o raw_value_from_c for uma string, é um valor direto (ou um valor formatado que deve ser tratado como string inicialmente)
-                                    if isinstance(raw_value_from_c, str):
-                                        processed_value = self._format_value(
-                                            raw_value_from_c, target_field_type
-                                        )
-                                        pydantic_input_row[target_csv_field] = (
-                                            processed_value
-                                        )
-                                        # logger.debug(f"  L{i}Del({target_csv_field}):R bit0(Novo), C_delta[{c_delta_idx}]='{raw_value_from_c}' (STR Direto) -> '{processed_value}'")
-                                    elif isinstance(raw_value_from_c, (int, float)):
-                                        dict_name = schema_item.get("DN")
-                                        # Caso 1: É um índice para um ValueDict
-                                        if dict_name:
-                                            if (
-                                                dict_name in value_dicts
-                                                and isinstance(raw_value_from_c, int)
-                                                and 0
-                                                <= raw_value_from_c
-                                                < len(value_dicts[dict_name])
-                                            ):
-                                                val_from_dict = value_dicts[dict_name][
-                                                    raw_value_from_c
-                                                ]
-                                                processed_value = self._format_value(
-                                                    val_from_dict, target_field_type
-                                                )
-                                                pydantic_input_row[target_csv_field] = (
-                                                    processed_value
-                                                )
-                                                # logger.debug(f"  L{i}Del({target_csv_field}):R bit0(Novo), C_delta[{c_delta_idx}]={raw_value_from_c} (Índice VD '{dict_name}') -> DictVal '{val_from_dict}' -> '{processed_value}'")
-                                            else:
-                                                # Fallback para herdar se o índice do dicionário for inválido ou VD não encontrado
-                                                pydantic_input_row[target_csv_field] = (
-                                                    last_processed_pydantic_row.get(
-                                                        target_csv_field,
-                                                        csv_field_cfg.get("default"),
-                                                    )
-                                                )
-                                                logger.warning(
-                                                    f"Pág{page_index},L{i}Del({target_csv_field}):R bit0 (Novo),"
-                                                    f"VD'{dict_name}',C_del idx'{raw_value_from_c}'OOB. Herdando."
-                                                )
-                                        # Caso 2: É um valor numérico direto (ex: ano, ordem, valor original float)
-                                        else:
-                                            processed_value = self._format_value(
-                                                str(raw_value_from_c), target_field_type
-                                            )  # _format_value espera string
                                             pydantic_input_row[target_csv_field] = (
                                                 processed_value
                                             )
-                                            # logger.debug(f"  L{i}Del({target_csv_field}):R bit0(Novo), C_delta[{c_delta_idx}]={raw_value_from_c} (Numérico Direto) -> '{processed_value}'")
+                                            # logger.debug(f"  L{i}Del({target_csv_field}):R bit0(Novo), C{col_idx}={raw_value_from_c} (Índice VD '{dict_name}') -> DictVal '{val_from_dict}' -> '{processed_value}'")
+                                        else:
+                                            # Índice do dicionário inválido ou VD não encontrado:
+                                            # mantém o valor herdado da linha anterior
+                                            logger.warning(
+                                                "value_dict_indice_invalido_delta_herdando",
+                                                page_index=page_index,
+                                                row_index=i,
+                                                col_index=col_idx,
+                                                csv_field=target_csv_field,
+                                                dict_name=dict_name,
+                                                raw_value=raw_value_from_c,
+                                                list_len=(
+                                                    len(vd_list)
+                                                    if vd_list is not None
+                                                    else None
+                                                ),
+                                            )
+                                    # Caso 2: É um valor numérico direto (ex: ano, ordem, valor original float)
                                     else:
-                                        # Tipo inesperado em C_delta, herdar como fallback seguro
+                                        processed_value = format_value(
+                                            str(raw_value_from_c), target_field_type
+                                        )  # _format_value espera string
                                         pydantic_input_row[target_csv_field] = (
-                                            last_processed_pydantic_row.get(
-                                                target_csv_field,
-                                                csv_field_cfg.get("default"),
-                                            )
-                                        )
-                                        logger.error(
-                                            f"Pág{page_index},L{i}Del({target_csv_field}):R bit0 (Novo), C_delta[{c_delta_idx}]={raw_value_from_c} (Tipo Inesperado {type(raw_value_from_c)}). Herdando."
+                                            processed_value
                                         )
-                                    c_delta_idx += 1
+                                        # logger.debug(f"  L{i}Del({target_csv_field}):R bit0(Novo), C{col_idx}={raw_value_from_c} (Numérico Direto) -> '{processed_value}'")
+                                else:
+                                    # Tipo inesperado em C_delta: mantém o valor herdado como fallback seguro
+                                    logger.error(
+                                        "valor_delta_tipo_inesperado_herdando",
+                                        page_index=page_index,
+                                        row_index=i,
+                                        col_index=col_idx,
+                                        csv_field=target_csv_field,
+                                        raw_value=raw_value_from_c,
+                                        raw_type=type(raw_value_from_c).__name__,
+                                    )
 
-                        last_processed_pydantic_row = pydantic_input_row.copy()
+                        last_processed_pydantic_row = pydantic_input_row
 
                     # LOGGING ADICIONADO PARA DEBUG DE LINHAS DELTA - Removido, pois agora processamos com Rulifier
 
+                    # Só a validação fica no try; o restante do caminho de sucesso não levanta
                     try:
-                        precatorio_obj = Precatorio(**pydantic_input_row)
-                        dumped_row = precatorio_obj.dict()
-
-                        current_order_in_normalized_list += 1
-                        dumped_row["ordem"] = current_order_in_normalized_list
-
-                        logger.debug(
-                            "pydantic_output_post_dump",
-                            row_index_in_page=i,
-                            page_index=page_index,
-                            dumped_data=dumped_row,
-                        )
-                        normalized_rows.append(dumped_row)
-                        self.current_entity_processed_records += 1
-                        RECORDS_PROCESSED.labels(
-                            entity=(
-                                self.current_entity_slug
-                                if hasattr(self, "current_entity_slug")
-                                else "unknown_entity_norm"
-                            )
-                        ).inc()
+                        # Mesmos validadores do Precatorio, sem instanciar o modelo nem
+                        # copiar tudo de volta com .dict(); campos já vistos vêm do cache
+                        dumped_row = validate_row(pydantic_input_row)
                     except ValidationError as e:
                         logger.error(
                             "erro_validacao_pydantic",
@@ -1079,6 +1470,7 @@ class PrecatoriosCrawler:
                             pydantic_input=pydantic_input_row,
                             errors=e.errors(),
                         )
+                        continue
                     except Exception as e_gen:
                         logger.error(
                             "erro_desconhecido_durante_validacao_pydantic",
@@ -1089,6 +1481,20 @@ class PrecatoriosCrawler:
                             pydantic_input=pydantic_input_row,
                             exc_info=True,
                         )
+                        continue
+
+                    current_order_in_normalized_list += 1
+                    dumped_row["ordem"] = current_order_in_normalized_list
+
+                    if debug_enabled:
+                        logger.debug(
+                            "pydantic_output_post_dump",
+                            row_index_in_page=i,
+                            page_index=page_index,
+                            dumped_data=dumped_row,
+                        )
+                    normalized_count += 1
+                    yield dumped_row
             except Exception as e:
                 logger.error(
                     "erro_processar_pagina_response",
@@ -1097,108 +1503,120 @@ class PrecatoriosCrawler:
                     exc_info=True,
                 )
                 continue
+            finally:
+                # Métrica e contador atualizados uma vez por página, não por linha
+                page_records = normalized_count - page_start_count
+                if page_records:
+                    records_counter.inc(page_records)
+                    with self._processed_records_lock:
+                        self.current_entity_processed_records += page_records
 
         logger.info(
             "normalize_to_rows_finalizado",
             total_raw_records=total_raw_records_count,
-            normalized_records=len(normalized_rows),
+            normalized_records=normalized_count,
         )
-        return normalized_rows, current_order_in_normalized_list
 
-    def write_csv(self, rows: List[Dict], out_file: str):
-        """Escreve os dados em um arquivo CSV."""
+    def write_csv(self, rows: Iterable[Dict], out_file: str) -> int:
+        """Escreve os dados em um arquivo CSV e retorna o número de linhas escritas.
+
+        Aceita lista ou gerador (ex: iter_all_precatorios_rows): as linhas são
+        formatadas e escritas uma a uma, sem materializar uma segunda cópia.
+        """
         logger.info(
             "write_csv_iniciado",
-            num_rows=len(rows) if rows else 0,
+            num_rows=len(rows) if isinstance(rows, list) else None,
             output_file=out_file,
         )
 
-        if not rows:
-            logger.warning("nenhum_dado_para_escrever_csv", output_file=out_file)
-            try:
-                with open(out_file, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(
-                        f, fieldnames=self.field_config_instance.csv_fields
-                    )
-                    writer.writeheader()
-                logger.info("csv_vazio_com_cabecalhos_escrito", output_file=out_file)
-            except Exception as e:
-                logger.error(
-                    "erro_escrever_csv_vazio",
-                    error=str(e),
-                    output_file=out_file,
-                    exc_info=True,
-                )
-            return
-
-        ordered_rows = []
-        for i, row_data in enumerate(rows):
-            ordered_row = {
-                field: row_data.get(field)
-                for field in self.field_config_instance.csv_fields
-            }
-
-            # Formatar data_cadastro
-            data_cadastro_obj = ordered_row.get("data_cadastro")
-            if isinstance(data_cadastro_obj, datetime):
-                ordered_row["data_cadastro"] = data_cadastro_obj.strftime("%d/%m/%Y")
-            elif data_cadastro_obj is None or str(data_cadastro_obj).strip() == "":
-                ordered_row["data_cadastro"] = ""  # Ou "-" se preferir
-            # Se já for string (ex: de um erro anterior ou já formatado), mantém
+        debug_enabled = _debug_enabled()
+        csv_fields = self.field_config_instance.csv_fields
+        num_rows_written = 0
 
-            # Formatar valores monetários
-            for field_name in ["valor_original", "valor_atual"]:
-                valor_obj = ordered_row.get(field_name)
-                if isinstance(valor_obj, Decimal):
-                    try:
-                        ordered_row[field_name] = format_currency(float(valor_obj))
-                    except Exception as e_format:
-                        logger.warning(
-                            f"Erro ao formatar '{field_name}' ('{valor_obj}') como moeda: {e_format}. Usando str."
-                        )
-                        ordered_row[field_name] = str(valor_obj)  # Fallback para string
-                elif valor_obj is None:  # Se for None, formata como R$ 0,00
-                    ordered_row[field_name] = format_currency(0.0)
-                # Se já for string (ex: já formatado ou placeholder), mantém
+        def ordered_rows() -> Iterator[List[Any]]:
+            nonlocal num_rows_written
+            for i, row_data in enumerate(rows):
+                ordered_row = self._csv_row_values(row_data)
 
-            logger.debug(
-                "write_csv_constructing_ordered_row",
-                row_index_in_list=i,
-                constructed_ordered_row=ordered_row,
-                original_row_data_from_list=row_data,
-            )
-            # Log para a primeira linha que será escrita (após ordenação)
-            if i == 0:
-                logger.info(
-                    "write_csv_primeira_linha_ordenada_para_escrita",
-                    primeira_linha=ordered_row,
-                )
-            ordered_rows.append(ordered_row)
+                if debug_enabled:
+                    logger.debug(
+                        "write_csv_constructing_ordered_row",
+                        row_index_in_list=i,
+                        constructed_ordered_row=ordered_row,
+                        original_row_data_from_list=row_data,
+                    )
+                # Log para a primeira linha que será escrita (após ordenação)
+                if i == 0:
+                    logger.info(
+                        "write_csv_primeira_linha_ordenada_para_escrita",
+                        primeira_linha=dict(zip(csv_fields, ordered_row)),
+                    )
+                num_rows_written += 1
+                yield ordered_row
 
         try:
             with open(out_file, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(
-                    f, fieldnames=self.field_config_instance.csv_fields
+                # csv.writer sobre listas já ordenadas: o DictWriter refaria a
+                # tradução dict -> lista em cada writerow
+                writer = csv.writer(f)
+                writer.writerow(csv_fields)
+                writer.writerows(ordered_rows())
+            if num_rows_written:
+                logger.info(
+                    f"Dados escritos em {out_file}", num_rows_written=num_rows_written
                 )
-                writer.writeheader()
-                # writer.writerows(ordered_rows) # Comentado para loop manual
-                for i, single_ordered_row in enumerate(ordered_rows):
-                    logger.debug(
-                        "write_csv_writing_single_row",
-                        row_index=i,
-                        row_data_to_write=single_ordered_row,
-                        row_data_types={
-                            k: str(type(v)) for k, v in single_ordered_row.items()
-                        },
-                    )
-                    writer.writerow(single_ordered_row)
-            logger.info(
-                f"Dados escritos em {out_file}", num_rows_written=len(ordered_rows)
-            )
+            else:
+                logger.warning("nenhum_dado_para_escrever_csv", output_file=out_file)
+                logger.info("csv_vazio_com_cabecalhos_escrito", output_file=out_file)
         except Exception as e:
             logger.error(
                 "erro_escrever_csv", error=str(e), output_file=out_file, exc_info=True
             )
+        return num_rows_written
+
+    def _csv_row_values(self, row_data: Dict[str, Any]) -> List[Any]:
+        """Monta os valores de uma linha do CSV na ordem de csv_fields.
+
+        Datas saem como dd/mm/aaaa e valores monetários formatados em reais.
+        """
+        try:
+            # Linhas normalizadas têm todos os campos: uma única chamada em C
+            ordered_row = list(self._csv_row_getter(row_data))
+        except KeyError:
+            ordered_row = [
+                row_data.get(field) for field in self.field_config_instance.csv_fields
+            ]
+
+        # Formatar data_cadastro
+        date_idx = self._csv_date_index
+        if date_idx is not None:
+            data_cadastro_obj = ordered_row[date_idx]
+            if isinstance(data_cadastro_obj, datetime):
+                # f-string em vez de strftime: sem parse do formato a cada linha
+                ordered_row[date_idx] = (
+                    f"{data_cadastro_obj.day:02d}/{data_cadastro_obj.month:02d}/"
+                    f"{data_cadastro_obj.year:04d}"
+                )
+            elif data_cadastro_obj is None or str(data_cadastro_obj).strip() == "":
+                ordered_row[date_idx] = ""  # Ou "-" se preferir
+            # Se já for string (ex: de um erro anterior ou já formatado), mantém
+
+        # Formatar valores monetários
+        for field_name, field_idx in self._csv_currency_indexes:
+            valor_obj = ordered_row[field_idx]
+            if isinstance(valor_obj, Decimal):
+                try:
+                    ordered_row[field_idx] = format_currency(valor_obj)
+                except Exception as e_format:
+                    logger.warning(
+                        f"Erro ao formatar '{field_name}' ('{valor_obj}') como moeda: {e_format}. Usando str."
+                    )
+                    ordered_row[field_idx] = str(valor_obj)  # Fallback para string
+            elif valor_obj is None:  # Se for None, formata como R$ 0,00
+                ordered_row[field_idx] = self._csv_zero_currency
+            # Se já for string (ex: já formatado ou placeholder), mantém
+
+        return ordered_row
 
     @track_time
     def crawl(self, entity_slug: str, out_file: str):
@@ -1206,35 +1624,23 @@ class PrecatoriosCrawler:
         try:
             logger.info("crawl_start", entity=entity_slug, output_file=out_file)
 
-            # Busca os dados
-            # Para o crawl completo, não especificamos 'count', então ele tentará buscar tudo com paginação.
+            # Busca, normaliza e escreve em streaming: as linhas saem página a página
+            # direto para o CSV. Para o crawl completo, não especificamos 'count',
+            # então ele tentará buscar tudo com paginação.
             logger.info("fetching_data", entity=entity_slug)
-            raw_data = self.fetch_all_precatorios_data(
-                entity_slug
-            )  # Não passa count aqui para buscar tudo
-
-            if not raw_data:
-                logger.warning("no_raw_data", entity=entity_slug)
-                return
+            rows = self.iter_all_precatorios_rows(entity_slug)
 
-            # Normaliza os dados
-            logger.info("normalizing_data", entity=entity_slug)
-            rows, _ = self.normalize_to_rows(raw_data)
+            logger.info("writing_csv", entity=entity_slug, file=out_file)
+            num_rows_written = self.write_csv(rows, out_file)
 
-            if not rows:
+            if not num_rows_written:
                 logger.warning("no_normalized_data", entity=entity_slug)
                 return
 
-            # Escreve o CSV
-            logger.info(
-                "writing_csv", entity=entity_slug, records=len(rows), file=out_file
-            )
-            self.write_csv(rows, out_file)
-
             logger.info(
                 "crawl_complete",
                 entity=entity_slug,
-                records=len(rows),
+                records=num_rows_written,
                 file=out_file,
             )
 
@@ -1248,12 +1654,32 @@ class PrecatoriosCrawler:
             )
             raise
 
-    def _get_base_field_name(self, api_name_str: str) -> str:
-        """Obtém o nome base do campo a partir do nome da API."""
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _present_columns(rulifier_r: int, num_columns: int) -> Tuple[int, ...]:
+        """Índices das colunas com bit 0 no Rulifier 'R' (valores novos em C_delta).
+
+        Percorre só os bits zerados (x & -x isola o menor) em vez de testar coluna
+        a coluna; as máscaras se repetem muito entre linhas, daí o cache.
+        """
+        new_value_mask = ~rulifier_r & ((1 << num_columns) - 1)
+        present_cols = []
+        while new_value_mask:
+            lowest_bit = new_value_mask & -new_value_mask
+            present_cols.append(lowest_bit.bit_length() - 1)
+            new_value_mask ^= lowest_bit
+        return tuple(present_cols)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_base_field_name(api_name_str: str) -> str:
+        """Obtém o nome base do campo a partir do nome da API.
+
+        Função pura sobre um conjunto pequeno de nomes de descritor: o cache evita
+        refazer regex/split a cada página.
+        """
         # Ex: 'Sum(dfslcp_SAPRE_LISTA_CRONO_PRECATORIO.dfslcp_num_ano_orcamento)' -> 'dfslcp_num_ano_orcamento'
-        match = re.match(
-            r"^[A-Za-z_0-9]+\\(([^)]+)\\)$", api_name_str
-        )  # Matches Agg(Content)
+        match = _AGG_RE.match(api_name_str)  # Matches Agg(Content)
         if match:
             content_inside_agg = match.group(1)
             if "." in content_inside_agg:
@@ -14,6 +14,7 @@ from io import StringIO
 from decimal import Decimal, InvalidOperation
 import urllib.parse
 
+import orjson
 import requests
 from pydantic import ValidationError
 
@@ -21,6 +22,7 @@ from config import (
     config,
     field_config,
 )
+from crawler.request_ids import fast_request_id
 from logger import get_logger
 from models.models import Edital
 from metrics import REQUESTS_TOTAL, RECORDS_PROCESSED, track_time
@@ -85,6 +87,8 @@ class EditalCrawler:
         self, restart_tokens: Optional[List[Any]] = None, count: int = 500
     ) -> Dict[str, Any]:
         """Constrói o payload para a requisição de editais."""
+        # Janela vinculada a um local: RestartTokens entra sem renavegar o payload
+        window = {"Count": count}
         payload = {
             "version": "1.0.0",
             "queries": [
@@ -215,7 +219,7 @@ class EditalCrawler:
                                         "DataReduction": {
                                             "DataVolume": 3,
                                             "Primary": {
-                                                "Window": {"Count": count}
+                                                "Window": window
                                             },
                                         },
                                         "Version": 1,
@@ -243,7 +247,7 @@ class EditalCrawler:
 
         # Adiciona RestartTokens se fornecidos
         if restart_tokens:
-            payload["queries"][0]["Query"]["Commands"][0]["SemanticQueryDataShapeCommand"]["Binding"]["DataReduction"]["Primary"]["Window"]["RestartTokens"] = restart_tokens
+            window["RestartTokens"] = restart_tokens
 
         return payload
 
@@ -322,19 +326,24 @@ class EditalCrawler:
         count: int = 500,
     ) -> Dict:
         """Busca uma página de dados da API de editais."""
-        current_headers = self.session.headers.copy()
-        current_headers.update(
-            {"ActivityId": str(uuid.uuid4()), "RequestId": str(uuid.uuid4())}
-        )
+        # Só os IDs mudam por requisição; o requests já mescla os headers da sessão
+        current_headers = {
+            "ActivityId": fast_request_id(),
+            "RequestId": fast_request_id(),
+        }
 
         payload = self._build_edital_payload(restart_tokens=restart_tokens, count=count)
 
         REQUESTS_TOTAL.labels(entity="edital").inc()
+        # Corpo serializado com orjson; o Content-Type JSON já vem dos headers da sessão
         response = self.session.post(
-            self.api_url, json=payload, headers=current_headers, timeout=180
+            self.api_url,
+            data=orjson.dumps(payload),
+            headers=current_headers,
+            timeout=180,
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def fetch_editais(self) -> List[Dict[str, Any]]:
         """Busca a lista de todos os editais disponíveis, lidando com paginação."""
@@ -692,36 +701,31 @@ class EditalCrawler:
         try:
             os.makedirs(os.path.dirname(out_file), exist_ok=True)
 
+            fieldnames = [
+                "ordem", "ano_orcamento", "natureza", "data_cadastro",
+                "precatorio", "status", "valor"
+            ]
+
+            def csv_rows():
+                for edital in editais:
+                    # Formatar dados para CSV, já na ordem das colunas
+                    csv_row = []
+                    for field in fieldnames:
+                        value = edital.get(field, "-")
+                        if field == "data_cadastro" and isinstance(value, str):
+                            # Já está formatado como dd/mm/yyyy
+                            csv_row.append(value)
+                        elif field == "valor" and isinstance(value, Decimal):
+                            csv_row.append(format_currency(float(value)))
+                        else:
+                            csv_row.append(str(value) if value != "-" else "")
+                    yield csv_row
+
             with open(out_file, "w", newline="", encoding="utf-8-sig") as f:
-                if editais:
-                    fieldnames = [
-                        "ordem", "ano_orcamento", "natureza", "data_cadastro",
-                        "precatorio", "status", "valor"
-                    ]
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-
-                    for edital in editais:
-                        # Formatar dados para CSV
-                        csv_row = {}
-                        for field in fieldnames:
-                            value = edital.get(field, "-")
-                            if field == "data_cadastro" and isinstance(value, str):
-                                # Já está formatado como dd/mm/yyyy
-                                csv_row[field] = value
-                            elif field == "valor" and isinstance(value, Decimal):
-                                csv_row[field] = format_currency(float(value))
-                            else:
-                                csv_row[field] = str(value) if value != "-" else ""
-
-                        writer.writerow(csv_row)
-                else:
-                    # Cabeçalhos mesmo se vazio
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        "ordem", "ano_orcamento", "natureza", "data_cadastro",
-                        "precatorio", "status", "valor"
-                    ])
+                # Cabeçalhos mesmo se vazio; as linhas vão num único writerows
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                writer.writerows(csv_rows())
 
             logger.info(f"Editais salvos em {out_file}", count=len(editais))
 
@@ -14,6 +14,7 @@ from io import StringIO
 from decimal import Decimal, InvalidOperation
 import urllib.parse
 
+import orjson
 import requests
 from pydantic import ValidationError
 
@@ -21,6 +22,7 @@ from config import (
     config,
     field_config,
 )
+from crawler.request_ids import fast_request_id
 from logger import get_logger
 from models.models import Pagamento
 from metrics import REQUESTS_TOTAL, RECORDS_PROCESSED, track_time
@@ -85,6 +87,8 @@ class PagamentosCrawler:
         self, restart_tokens: Optional[List[Any]] = None, count: int = 500
     ) -> Dict[str, Any]:
         """Constrói o payload para a requisição de pagamentos."""
+        # Janela vinculada a um local: RestartTokens entra sem renavegar o payload
+        window = {"Count": count}
         payload = {
             "version": "1.0.0",
             "queries": [
@@ -283,7 +287,7 @@ class PagamentosCrawler:
                                         "DataReduction": {
                                             "DataVolume": 3,
                                             "Primary": {
-                                                "Window": {"Count": count}
+                                                "Window": window
                                             },
                                         },
                                         "Version": 1,
@@ -311,7 +315,7 @@ class PagamentosCrawler:
 
         # Adiciona RestartTokens se fornecidos
         if restart_tokens:
-            payload["queries"][0]["Query"]["Commands"][0]["SemanticQueryDataShapeCommand"]["Binding"]["DataReduction"]["Primary"]["Window"]["RestartTokens"] = restart_tokens
+            window["RestartTokens"] = restart_tokens
 
         return payload
 
@@ -325,19 +329,24 @@ class PagamentosCrawler:
         count: int = 500,
     ) -> Dict:
         """Busca uma página de dados da API de pagamentos."""
-        current_headers = self.session.headers.copy()
-        current_headers.update(
-            {"ActivityId": str(uuid.uuid4()), "RequestId": str(uuid.uuid4())}
-        )
+        # Só os IDs mudam por requisição; o requests já mescla os headers da sessão
+        current_headers = {
+            "ActivityId": fast_request_id(),
+            "RequestId": fast_request_id(),
+        }
 
         payload = self._build_pagamentos_payload(restart_tokens=restart_tokens, count=count)
 
         REQUESTS_TOTAL.labels(entity="pagamentos").inc()
+        # Corpo serializado com orjson; o Content-Type JSON já vem dos headers da sessão
         response = self.session.post(
-            self.api_url, json=payload, headers=current_headers, timeout=180
+            self.api_url,
+            data=orjson.dumps(payload),
+            headers=current_headers,
+            timeout=180,
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def fetch_pagamentos(self) -> List[Dict[str, Any]]:
         """Busca a lista de todos os pagamentos disponíveis, lidando com paginação."""
@@ -667,40 +676,38 @@ class PagamentosCrawler:
         try:
             os.makedirs(os.path.dirname(out_file), exist_ok=True)
 
+            fieldnames = [
+                "quantidade", "modalidade", "natureza", "exercicio", "data_protocolo",
+                "precatorio", "credor_beneficiario", "tipo", "data_pagamento",
+                "cpf_cnpj", "valor_bruto", "previdencia", "irrf", "honorarios",
+                "valor_bruto_contratual", "rra", "valor_liquido"
+            ]
+            date_fields = {"data_protocolo", "data_pagamento"}
+            currency_fields = {
+                "valor_bruto", "previdencia", "irrf", "honorarios",
+                "valor_bruto_contratual", "rra", "valor_liquido"
+            }
+
+            def csv_rows():
+                for pagamento in pagamentos:
+                    # Formatar dados para CSV, já na ordem das colunas
+                    csv_row = []
+                    for field in fieldnames:
+                        value = pagamento.get(field, "-")
+                        if field in date_fields and isinstance(value, str):
+                            # Já está formatado como dd/mm/yyyy
+                            csv_row.append(value)
+                        elif field in currency_fields and isinstance(value, Decimal):
+                            csv_row.append(format_currency(float(value)))
+                        else:
+                            csv_row.append(str(value) if value != "-" else "")
+                    yield csv_row
+
             with open(out_file, "w", newline="", encoding="utf-8-sig") as f:
-                if pagamentos:
-                    fieldnames = [
-                        "quantidade", "modalidade", "natureza", "exercicio", "data_protocolo",
-                        "precatorio", "credor_beneficiario", "tipo", "data_pagamento",
-                        "cpf_cnpj", "valor_bruto", "previdencia", "irrf", "honorarios",
-                        "valor_bruto_contratual", "rra", "valor_liquido"
-                    ]
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-
-                    for pagamento in pagamentos:
-                        # Formatar dados para CSV
-                        csv_row = {}
-                        for field in fieldnames:
-                            value = pagamento.get(field, "-")
-                            if field in ["data_protocolo", "data_pagamento"] and isinstance(value, str):
-                                # Já está formatado como dd/mm/yyyy
-                                csv_row[field] = value
-                            elif field in ["valor_bruto", "previdencia", "irrf", "honorarios", "valor_bruto_contratual", "rra", "valor_liquido"] and isinstance(value, Decimal):
-                                csv_row[field] = format_currency(float(value))
-                            else:
-                                csv_row[field] = str(value) if value != "-" else ""
-
-                        writer.writerow(csv_row)
-                else:
-                    # Cabeçalhos mesmo se vazio
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        "quantidade", "modalidade", "natureza", "exercicio", "data_protocolo",
-                        "precatorio", "credor_beneficiario", "tipo", "data_pagamento",
-                        "cpf_cnpj", "valor_bruto", "previdencia", "irrf", "honorarios",
-                        "valor_bruto_contratual", "rra", "valor_liquido"
-                    ])
+                # Cabeçalhos mesmo se vazio; as linhas vão num único writerows
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                writer.writerows(csv_rows())
 
             logger.info(f"Pagamentos salvos em {out_file}", count=len(pagamentos))
 
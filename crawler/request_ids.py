@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""IDs de requisição (ActivityId/RequestId) compartilhados pelos crawlers."""
+import os
+import random
+
+# Os IDs são opacos para a API, então não precisam de uuid4 (leitura de
+# /dev/urandom a cada chamada).
+_REQUEST_ID_RNG = random.Random(os.urandom(16))
+# Re-semeia no filho após fork (ex: workers do gunicorn) para não repetir a sequência
+os.register_at_fork(after_in_child=lambda: _REQUEST_ID_RNG.seed(os.urandom(16)))
+
+
+def fast_request_id() -> str:
+    """Gera um ID aleatório no formato de GUID (8-4-4-4-12)."""
+    h = f"{_REQUEST_ID_RNG.getrandbits(128):032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
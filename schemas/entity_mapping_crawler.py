@@ -1,3 +1,4 @@
+import orjson
 import requests
 import os
 import csv
@@ -22,6 +23,9 @@ class EntityMappingCrawler:
         """Decodifica uma string com caracteres especiais em UTF-8."""
         if not isinstance(value, str):
             return str(value)
+        # ASCII sem barra invertida não tem escapes nem mojibake: a cadeia abaixo é identidade
+        if value.isascii() and "\\" not in value:
+            return value
         try:
             # Decodifica sequências de escape unicode (\u00XX)
             return (
@@ -179,9 +183,11 @@ class EntityMappingCrawler:
             payload = self._build_entity_payload(last_entity_for_token)
 
             try:
-                response = self.session.post(self.api_url, json=payload, timeout=60)
+                response = self.session.post(
+                    self.api_url, data=orjson.dumps(payload), timeout=60
+                )
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
             except requests.exceptions.Timeout:
                 logger.error(
                     f"Timeout ao buscar página {page_count} de entidades.",
@@ -296,8 +302,7 @@ class EntityMappingCrawler:
                     writer.writerow(
                         ["entidade"]
                     )  # Nome da coluna para o CSV de entidades
-                for entity in entities:
-                    writer.writerow([entity])
+                writer.writerows([entity] for entity in entities)
             logger.info(f"Lista de entidades salva em {out_file}", count=len(entities))
 
         except IOError as e:
@@ -8,6 +8,7 @@ import os
 import io
 import uuid
 
+import orjson
 import requests
 from flask import Flask, request, Response, jsonify
 
@@ -250,6 +251,48 @@ _PAYLOAD_STRUCTURE = {
     "modelId": 4287487,
 }
 
+# Serializado uma vez: cada página clona o payload com um parse em C em vez de dumps+loads
+_PAYLOAD_STRUCTURE_JSON = orjson.dumps(_PAYLOAD_STRUCTURE)
+
+
+def _build_page_payload(entity_literal: str, restart_tokens, page_count: int) -> dict:
+    """Clona o template do payload e ajusta só as folhas que mudam por página."""
+    payload_instance = orjson.loads(_PAYLOAD_STRUCTURE_JSON)
+
+    try:
+        payload_query_command = payload_instance["queries"][0]["Query"]["Commands"][0][
+            "SemanticQueryDataShapeCommand"
+        ]
+        where_values = payload_query_command["Query"]["Where"][0]["Condition"]["In"][
+            "Values"
+        ]
+        data_reduction_binding = payload_query_command["Binding"]["DataReduction"][
+            "Primary"
+        ]
+    except (KeyError, IndexError) as e:
+        logger.error(f"Erro ao tentar modificar o payload para paginação: {e}")
+        raise ValueError(
+            "Estrutura do payload inesperada ao tentar injetar entidade ou tokens."
+        )
+
+    # Modifica a condição Where para a entidade
+    where_values[0][0]["Literal"]["Value"] = entity_literal
+
+    # Configura a janela de paginação
+    window_binding = data_reduction_binding.setdefault("Window", {})
+    window_binding["Count"] = 500
+
+    # Adiciona RestartTokens se disponível
+    if restart_tokens:
+        window_binding["RestartTokens"] = restart_tokens
+    elif "RestartTokens" in window_binding:
+        del window_binding["RestartTokens"]
+
+    logger.info(
+        f"Página {page_count}: Enviando payload com Window: {json.dumps(window_binding)}"
+    )
+    return payload_instance
+
 
 # ——— FUNÇÃO DE FETCH + INJEÇÃO DE ENTIDADE E PAGINAÇÃO ——————————————————
 def fetch_data(entity: str) -> dict:
@@ -267,64 +310,29 @@ def fetch_data(entity: str) -> dict:
         current_headers["ActivityId"] = str(uuid.uuid4())
         current_headers["RequestId"] = str(uuid.uuid4())
 
-        payload_instance = json.loads(json.dumps(_PAYLOAD_STRUCTURE))
-
-        try:
-            payload_query_command = payload_instance["queries"][0]["Query"]["Commands"][
-                0
-            ]["SemanticQueryDataShapeCommand"]
-
-            # Ajusta o payload para solicitar explicitamente os ValueDicts
-            if page_count == 1:
-                logger.info(
-                    "Estrutura do payload da primeira página: "
-                    f"{json.dumps(payload_instance, indent=2)[:1000]}..."
-                )
-
-            # Modifica a condição Where para a entidade
-            payload_query_command["Query"]["Where"][0]["Condition"]["In"]["Values"][0][
-                0
-            ]["Literal"]["Value"] = val
-
-            # Ajusta as configurações de DataReduction
-            data_reduction_binding = payload_query_command["Binding"]["DataReduction"][
-                "Primary"
-            ]
-            if "Window" not in data_reduction_binding:
-                data_reduction_binding["Window"] = {}
-
-            # Configura a janela de paginação
-            window_binding = data_reduction_binding["Window"]
-            window_binding["Count"] = 500
-
-            # Adiciona RestartTokens se disponível
-            if restart_tokens:
-                window_binding["RestartTokens"] = restart_tokens
-            elif "RestartTokens" in window_binding:
-                del window_binding["RestartTokens"]
+        payload_instance = _build_page_payload(val, restart_tokens, page_count)
 
+        if page_count == 1:
             logger.info(
-                f"Página {page_count}: Enviando payload com Window: {json.dumps(window_binding)}"
-            )
-
-        except (KeyError, IndexError) as e:
-            logger.error(f"Erro ao tentar modificar o payload para paginação: {e}")
-            raise ValueError(
-                "Estrutura do payload inesperada ao tentar injetar entidade ou tokens."
+                "Estrutura do payload da primeira página: "
+                f"{json.dumps(payload_instance, indent=2)[:1000]}..."
             )
 
         resp = requests.post(
-            API_URL, headers=current_headers, json=payload_instance, timeout=60
+            API_URL,
+            headers=current_headers,
+            data=orjson.dumps(payload_instance),
+            timeout=60,
         )
         resp.raise_for_status()
-        resp_json_page = resp.json()
+        resp_json_page = orjson.loads(resp.content)
         last_successful_resp_json_page = resp_json_page
 
-        # Log detalhado da primeira resposta
-        if page_count == 1:
-            logger.info(
-                "Estrutura completa da primeira resposta: "
-                f"{json.dumps(resp_json_page, indent=2)}"
+        # Log detalhado da primeira resposta (truncado; respostas podem ter vários MB)
+        if page_count == 1 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Início da primeira resposta: "
+                f"{resp.content[:2048].decode('utf-8', errors='replace')}"
             )
 
         # Extrai dados desta página
@@ -3,8 +3,8 @@ from datetime import datetime
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
-from crawler import PrecatoriosCrawler
-from models import Precatorio
+from crawler.crawler import PrecatoriosCrawler
+from models.models import Precatorio
 
 
 @pytest.fixture
@@ -0,0 +1,73 @@
+import pytest
+
+from config import field_config
+from crawler.crawler import PrecatoriosCrawler
+
+
+@pytest.fixture
+def crawler():
+    return PrecatoriosCrawler()
+
+
+def _page(data_rows):
+    """Monta uma página mínima do Power BI com uma coluna sem mapeamento no meio."""
+    selects = [
+        {"Name": "d.dfslcp_dsc_proc_precatorio"},
+        {"Name": "d.coluna_sem_mapeamento"},
+        {"Name": "d.dfslcp_dsc_comarca"},
+    ]
+    return {
+        "results": [
+            {
+                "result": {
+                    "data": {
+                        "descriptor": {"Select": selects},
+                        "dsr": {"DS": [{"PH": [{"DM0": data_rows}], "ValueDicts": {}}]},
+                    }
+                }
+            }
+        ]
+    }
+
+
+def test_delta_row_with_unmapped_column_keeps_c_aligned(crawler):
+    """Valor novo de coluna sem mapeamento ainda consome sua posição em C"""
+    data_rows = [
+        {
+            "S": [{"N": "G0"}, {"N": "G1"}, {"N": "G2"}],
+            "C": ["0001", "x", "FORTALEZA"],
+        },
+        # Bit 0 setado: herda processo; colunas 1 (sem mapeamento) e 2 trazem valores novos
+        {"R": 1, "C": ["y", "SOBRAL"]},
+    ]
+
+    rows, last_order = crawler.normalize_to_rows([_page(data_rows)])
+
+    assert last_order == 2
+    assert [row["processo"] for row in rows] == ["0001", "0001"]
+    assert [row["comarca"] for row in rows] == ["FORTALEZA", "SOBRAL"]
+
+
+def test_format_date_from_datetime_literal(crawler):
+    """Testa o literal datetime(...) do Power BI em campos de data"""
+    assert crawler._format_value("datetime(2020,1,2)", "date") == "2020-01-02 00:00:00"
+
+
+def test_format_decimal_with_thousands_comma(crawler):
+    """Testa valor no formato 1,234.56 (vírgula como separador de milhar)"""
+    assert crawler._format_value("1,234.56", "Decimal") == "1234.56"
+
+
+def test_csv_row_values_with_single_field(monkeypatch):
+    """Com um só campo no CSV a linha não é quebrada em caracteres"""
+    monkeypatch.setattr(field_config, "csv_fields", ["processo"])
+    crawler = PrecatoriosCrawler()
+
+    assert crawler._csv_row_values({"processo": "0001"}) == ["0001"]
+
+
+def test_format_date_with_out_of_range_ms_timestamp(crawler):
+    """Timestamp em ms dentro da faixa mas depois do ano 9999 vira data vazia"""
+    # Direto em _format_date: o _format_value engoliria a exceção com um format_error
+    value = "290000000000000"
+    assert crawler._format_date(value, value, "date") == ""
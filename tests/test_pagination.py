@@ -0,0 +1,163 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from config import CrawlerConfig
+from crawler.crawler import PrecatoriosCrawler
+
+
+@pytest.fixture
+def crawler():
+    return PrecatoriosCrawler()
+
+
+# RestartTokens devolvidos por cada página; a última não traz RT e encerra a paginação
+_PAGES = [
+    (None, [["'0001'"]], ["0001", "0002"]),
+    ([["'0001'"]], [["'0003'"]], ["0003", "0004"]),
+    ([["'0003'"]], None, ["0005", "0006"]),
+]
+
+
+def _page_response(processos, restart_tokens):
+    """Monta a resposta mínima de uma página do Power BI, uma linha base por processo."""
+    ds = {
+        "PH": [{"DM0": [{"S": [{"N": "G0"}], "C": [processos[0]]}]}],
+        "ValueDicts": {},
+    }
+    # Linhas delta com a coluna 0 nova (R=0)
+    ds["PH"][0]["DM0"].extend({"R": 0, "C": [p]} for p in processos[1:])
+    if restart_tokens:
+        ds["RT"] = restart_tokens
+    return {
+        "results": [
+            {
+                "result": {
+                    "data": {
+                        "descriptor": {
+                            "Select": [{"Name": "d.dfslcp_dsc_proc_precatorio"}]
+                        },
+                        "dsr": {"DS": [ds]},
+                    }
+                }
+            }
+        ]
+    }
+
+
+class _FakeFetchPage:
+    """Substitui _fetch_page: responde pela página dos RestartTokens e registra as chamadas."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, entity, restart_tokens=None, count=None, year=None):
+        with self._lock:
+            self.calls.append(restart_tokens)
+        for expected_tokens, next_tokens, processos in _PAGES:
+            if expected_tokens == restart_tokens:
+                return _page_response(processos, next_tokens)
+        raise AssertionError(f"RestartTokens inesperados: {restart_tokens}")
+
+
+def _set_prefetch(monkeypatch, crawler, enabled):
+    monkeypatch.setenv("PAGE_PREFETCH_ENABLED", "true" if enabled else "false")
+    monkeypatch.setattr(crawler, "config_instance", CrawlerConfig())
+
+
+@pytest.mark.parametrize("prefetch_enabled", [True, False])
+def test_pagination_passes_restart_tokens_and_keeps_ordem(
+    monkeypatch, crawler, prefetch_enabled
+):
+    """Os RT da página N vão para a N+1 e a ordem segue contínua entre páginas"""
+    _set_prefetch(monkeypatch, crawler, prefetch_enabled)
+    fake_fetch_page = _FakeFetchPage()
+
+    with patch.object(crawler, "_fetch_page", side_effect=fake_fetch_page):
+        rows = list(crawler.iter_all_precatorios_rows("municipio-de-fortaleza"))
+
+    assert fake_fetch_page.calls == [tokens for tokens, _, _ in _PAGES]
+    assert [row["processo"] for row in rows] == [
+        "0001",
+        "0002",
+        "0003",
+        "0004",
+        "0005",
+        "0006",
+    ]
+    assert [row["ordem"] for row in rows] == [1, 2, 3, 4, 5, 6]
+
+
+def test_prefetch_disabled_matches_sequential_rows(monkeypatch, crawler):
+    """PAGE_PREFETCH_ENABLED=false gera as mesmas linhas do caminho com prefetch"""
+    results = {}
+    for enabled in (True, False):
+        _set_prefetch(monkeypatch, crawler, enabled)
+        with patch.object(crawler, "_fetch_page", side_effect=_FakeFetchPage()):
+            results[enabled] = list(
+                crawler.iter_all_precatorios_rows("municipio-de-fortaleza")
+            )
+
+    assert results[True] == results[False]
+
+
+@pytest.mark.parametrize("prefetch_enabled", [True, False])
+def test_closing_generator_early_fetches_at_most_one_extra_page(
+    monkeypatch, crawler, prefetch_enabled
+):
+    """Fechar o gerador na primeira página deixa no máximo uma busca especulativa"""
+    _set_prefetch(monkeypatch, crawler, prefetch_enabled)
+    fake_fetch_page = _FakeFetchPage()
+
+    with patch.object(crawler, "_fetch_page", side_effect=fake_fetch_page):
+        rows_iter = crawler.iter_all_precatorios_rows("municipio-de-fortaleza")
+        first_row = next(rows_iter)
+        rows_iter.close()
+        # Dá tempo para uma eventual busca especulativa em andamento terminar
+        time.sleep(0.1)
+
+    assert first_row["processo"] == "0001"
+    assert len(fake_fetch_page.calls) <= (2 if prefetch_enabled else 1)
+    assert fake_fetch_page.calls[0] is None
+    # A busca especulativa, se houve, usou os RT da primeira página
+    assert fake_fetch_page.calls[1:] in ([], [_PAGES[1][0]])
+
+
+def test_fetch_many_dedupes_entities_and_counts_all_records(crawler):
+    """Entidades repetidas são buscadas uma vez e o contador soma todas as linhas"""
+    processos_by_entity = {
+        "municipio-de-fortaleza": ["0001", "0002"],
+        "estado-do-ceara": ["0003", "0004", "0005"],
+    }
+    fetched = []
+    fetched_lock = threading.Lock()
+
+    def fake_fetch_all(
+        entity_slug_or_official_name, count_per_page=None, year=None
+    ):
+        with fetched_lock:
+            fetched.append(entity_slug_or_official_name)
+        processos = processos_by_entity[entity_slug_or_official_name]
+        # Normaliza de verdade para passar pelo contador compartilhado entre as threads
+        rows, _ = crawler.normalize_to_rows([_page_response(processos, None)])
+        return rows
+
+    with patch.object(
+        crawler, "fetch_all_precatorios_data", side_effect=fake_fetch_all
+    ):
+        results = crawler.fetch_many_precatorios_data(
+            [
+                "municipio-de-fortaleza",
+                "estado-do-ceara",
+                "municipio-de-fortaleza",
+                "estado-do-ceara",
+            ]
+        )
+
+    assert sorted(fetched) == ["estado-do-ceara", "municipio-de-fortaleza"]
+    assert list(results) == ["municipio-de-fortaleza", "estado-do-ceara"]
+    assert [len(rows) for rows in results.values()] == [2, 3]
+    assert crawler.current_entity_processed_records == 5
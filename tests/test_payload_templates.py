@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from crawler.crawler import PrecatoriosCrawler
+
+
+@pytest.fixture
+def crawler():
+    return PrecatoriosCrawler()
+
+
+# RestartTokens com aspas, barra invertida e texto não-ASCII, como devolvidos pela API
+_RESTART_TOKENS = [["'MUNICÍPIO DE FORTALEZA'", '"aspas" \\ barra', "12345L", 1.5]]
+
+
+@pytest.mark.parametrize("year", [None, 2024])
+@pytest.mark.parametrize("restart_tokens", [None, _RESTART_TOKENS])
+@pytest.mark.parametrize("count", [None, 1, 500])
+def test_rendered_body_matches_payload(crawler, year, restart_tokens, count):
+    """Cada um dos quatro templates renderizado é igual ao payload montado em dict"""
+    body = crawler._render_payload_body(
+        "municipio-de-fortaleza",
+        count=count,
+        year=year,
+        restart_tokens=restart_tokens,
+    )
+
+    assert json.loads(body) == crawler.get_precatorios_payload(
+        "municipio-de-fortaleza",
+        count=count,
+        year=year,
+        restart_tokens=restart_tokens,
+    )